@@ -1,17 +1,22 @@
 from configparser import ConfigParser
 from shutil import copyfile
 import os.path
-from pkg_resources import resource_string
+from importlib.resources import files
 from numcodecs import Blosc
 
 
+# Accepted truthy spellings for boolean configuration values.
+# Precompiled as a frozenset so lookups are O(1) and no list is rebuilt per call.
+_truthy_config_values = frozenset({'true', '1', 't', 'y', 'yes'})
+
+
 def config_str_to_bool(input_str):
     """
     :param input_str: The input string to convert to bool value
     :type input_str: str
     :return: bool
     """
-    return input_str.lower() in ['true', '1', 't', 'y', 'yes']
+    return input_str.strip().lower() in _truthy_config_values
 
 
 class DataDirectoriesConfigurationRepresentation:
@@ -39,18 +44,35 @@ def isfloat(value):
         return False
 
 
+# Cache of already-parsed configuration files, keyed on (absolute path, mtime, size)
+# so repeated read_configuration() calls skip both file I/O and ConfigParser parsing.
+_CONFIG_CACHE = {}
+
+
 class ConfigurationRepresentation(object):
     """ A small utility class for object representation of a standard config. file. """
 
     def __init__(self, file_name):
         """ Initializes the configuration representation with a supplied file. """
-        parser = ConfigParser()
-        parser.optionxform = str  # make option names case sensitive
-        found = parser.read(file_name)
-        if not found:
+        try:
+            file_stat = os.stat(file_name)
+        except OSError:
             raise ValueError("Configuration file {0} not found".format(file_name))
-        for name in parser.sections():
-            dict_section = {name: dict(parser.items(name))}  # create dictionary representation for section
+
+        cache_key = (os.path.abspath(file_name), file_stat.st_mtime_ns, file_stat.st_size)
+        cached_sections = _CONFIG_CACHE.get(cache_key)
+        if cached_sections is None:
+            parser = ConfigParser()
+            parser.optionxform = str  # make option names case sensitive
+            found = parser.read(file_name)
+            if not found:
+                raise ValueError("Configuration file {0} not found".format(file_name))
+            # Build a plain dict-of-dicts representation of the parsed sections
+            cached_sections = {name: dict(parser.items(name)) for name in parser.sections()}
+            _CONFIG_CACHE[cache_key] = cached_sections
+
+        for name, section in cached_sections.items():
+            dict_section = {name: dict(section)}  # copy section so cached data stays pristine
             self.__dict__.update(dict_section)  # add section dictionary to root dictionary
 
     def __getitem__(self, item):
@@ -59,13 +81,7 @@ class ConfigurationRepresentation(object):
 
 class FTPConfigurationRepresentation(object):
     """ Utility class for object representation of FTP module configuration. """
-    enabled = False  # Specifies whether the FTP module should be enabled or not
-    server = ""  # FTP server to connect to
-    username = ""  # Username to login with. Set username and password to blank for anonymous login
-    password = ""  # Password to login with. Set username and password to blank for anonymous login
-    use_tls = False  # Whether the connection should use TLS encryption
-    directory = ""  # Directory on FTP server to download files from
-    files = []  # List of files within directory to download. Set to empty list to download all files within directory
+    __slots__ = ("enabled", "server", "username", "password", "use_tls", "directory", "files")
 
     def __init__(self, runtime_config=None):
         """
@@ -73,53 +89,46 @@ class FTPConfigurationRepresentation(object):
         :param runtime_config: runtime_config data to extract FTP settings from
         :type runtime_config: ConfigurationRepresentation
         """
-        if runtime_config is not None:
-            # Check if [ftp] section exists in config
-            if hasattr(runtime_config, "ftp"):
-                # Extract relevant settings from config file
-                if "enabled" in runtime_config.ftp:
-                    self.enabled = config_str_to_bool(runtime_config.ftp["enabled"])
-                if "server" in runtime_config.ftp:
-                    self.server = runtime_config.ftp["server"]
-                if "username" in runtime_config.ftp:
-                    self.username = runtime_config.ftp["username"]
-                if "password" in runtime_config.ftp:
-                    self.password = runtime_config.ftp["password"]
-                if "use_tls" in runtime_config.ftp:
-                    self.use_tls = config_str_to_bool(runtime_config.ftp["use_tls"])
-                if "directory" in runtime_config.ftp:
-                    self.directory = runtime_config.ftp["directory"]
-
-                # Convert delimited list of files (string) to Python-style list
-                if "file_delimiter" in runtime_config.ftp:
-                    delimiter = runtime_config.ftp["file_delimiter"]
-                else:
-                    delimiter = "|"
+        self.enabled = False  # Specifies whether the FTP module should be enabled or not
+        self.server = ""  # FTP server to connect to
+        self.username = ""  # Username to login with. Set username and password to blank for anonymous login
+        self.password = ""  # Password to login with. Set username and password to blank for anonymous login
+        self.use_tls = False  # Whether the connection should use TLS encryption
+        self.directory = ""  # Directory on FTP server to download files from
+        self.files = []  # Files within directory to download. Empty list downloads all files within directory
+
+        # Check if [ftp] section exists in config
+        section = getattr(runtime_config, "ftp", None) if runtime_config is not None else None
+        if section is None:
+            return
 
-                if "files" in runtime_config.ftp:
-                    files_str = str(runtime_config.ftp["files"])
-                    if files_str == "*":
-                        self.files = []
-                    else:
-                        self.files = files_str.split(delimiter)
+        # Extract relevant settings from the section dictionary
+        self.enabled = config_str_to_bool(section.get("enabled", "false"))
+        self.server = section.get("server", self.server)
+        self.username = section.get("username", self.username)
+        self.password = section.get("password", self.password)
+        self.use_tls = config_str_to_bool(section.get("use_tls", "false"))
+        self.directory = section.get("directory", self.directory)
 
+        # Convert delimited list of files (string) to Python-style list
+        delimiter = section.get("file_delimiter", "|")
+        files_str = section.get("files")
+        if files_str is not None:
+            files_str = str(files_str)
+            if files_str != "*":
+                self.files = files_str.split(delimiter)
 
-vcf_to_zarr_compressor_types = ["Blosc"]
-vcf_to_zarr_blosc_algorithm_types = ["zstd", "blosclz", "lz4", "lz4hc", "zlib", "snappy"]
-vcf_to_zarr_blosc_shuffle_types = [Blosc.NOSHUFFLE, Blosc.SHUFFLE, Blosc.BITSHUFFLE, Blosc.AUTOSHUFFLE]
+
+vcf_to_zarr_compressor_types = frozenset(["Blosc"])
+vcf_to_zarr_blosc_algorithm_types = frozenset(["zstd", "blosclz", "lz4", "lz4hc", "zlib", "snappy"])
+vcf_to_zarr_blosc_shuffle_types = frozenset([Blosc.NOSHUFFLE, Blosc.SHUFFLE, Blosc.BITSHUFFLE, Blosc.AUTOSHUFFLE])
 
 
 class VCFtoZarrConfigurationRepresentation:
     """ Utility class for object representation of VCF to Zarr conversion module configuration. """
-    enabled = False  # Specifies whether the VCF to Zarr conversion module should be enabled or not
-    fields = None
-    alt_number = None  # Alt number to use when converting to Zarr format. If None, then this will need to be determined
-    chunk_length = None  # Number of variants of chunks in which data are processed. If None, use default value
-    chunk_width = None  # Number of samples to use when storing chunks in output. If None, use default value
-    compressor = "Blosc"  # Specifies compressor type to use for Zarr conversion
-    blosc_compression_algorithm = "zstd"
-    blosc_compression_level = 1  # Level of compression to use for Zarr conversion
-    blosc_shuffle_mode = Blosc.AUTOSHUFFLE
+    __slots__ = ("enabled", "fields", "alt_number", "chunk_length", "chunk_width", "buffer_size", "compressor",
+                 "blosc_compression_algorithm", "blosc_compression_level", "blosc_shuffle_mode",
+                 "blosc_blocksize", "blosc_nthreads")
 
     def __init__(self, runtime_config=None):
         """
@@ -127,73 +136,128 @@ class VCFtoZarrConfigurationRepresentation:
         :param runtime_config: runtime_config data to extract conversion configuration from
         :type runtime_config: ConfigurationRepresentation
         """
-        if runtime_config is not None:
-            # Check if [vcf_to_zarr] section exists in config
-            if hasattr(runtime_config, "vcf_to_zarr"):
-                # Extract relevant settings from config file
-                if "enabled" in runtime_config.vcf_to_zarr:
-                    self.enabled = config_str_to_bool(runtime_config.vcf_to_zarr["enabled"])
-                if "alt_number" in runtime_config.vcf_to_zarr:
-                    alt_number_str = runtime_config.vcf_to_zarr["alt_number"]
-
-                    if str(alt_number_str).lower() == "auto":
-                        self.alt_number = None
-                    elif isint(alt_number_str):
-                        self.alt_number = int(alt_number_str)
-                    else:
-                        raise TypeError("Invalid value provided for alt_number in configuration.\n"
-                                        "Expected: \"auto\" or integer value")
-                if "chunk_length" in runtime_config.vcf_to_zarr:
-                    chunk_length_str = runtime_config.vcf_to_zarr["chunk_length"]
-                    if chunk_length_str == "default":
-                        self.chunk_length = None
-                    elif isint(chunk_length_str):
-                        self.chunk_length = int(chunk_length_str)
-                    else:
-                        raise TypeError("Invalid value provided for chunk_length in configuration.\n"
-                                        "Expected: \"default\" or integer value")
-                if "chunk_width" in runtime_config.vcf_to_zarr:
-                    chunk_width_str = runtime_config.vcf_to_zarr["chunk_width"]
-                    if chunk_width_str == "default":
-                        self.chunk_width = None
-                    elif isint(chunk_width_str):
-                        self.chunk_width = int(chunk_width_str)
-                    else:
-                        raise TypeError("Invalid value provided for chunk_width in configuration.\n"
-                                        "Expected: \"default\" or integer value")
-                if "compressor" in runtime_config.vcf_to_zarr:
-                    compressor_temp = runtime_config.vcf_to_zarr["compressor"]
-                    # Ensure compressor type specified is valid
-                    if compressor_temp in vcf_to_zarr_compressor_types:
-                        self.compressor = compressor_temp
-                if "blosc_compression_algorithm" in runtime_config.vcf_to_zarr:
-                    blosc_compression_algorithm_temp = runtime_config.vcf_to_zarr["blosc_compression_algorithm"]
-                    if blosc_compression_algorithm_temp in vcf_to_zarr_blosc_algorithm_types:
-                        self.blosc_compression_algorithm = blosc_compression_algorithm_temp
-                if "blosc_compression_level" in runtime_config.vcf_to_zarr:
-                    blosc_compression_level_str = runtime_config.vcf_to_zarr["blosc_compression_level"]
-                    if isint(blosc_compression_level_str):
-                        compression_level_int = int(blosc_compression_level_str)
-                        if (compression_level_int >= 0) and (compression_level_int <= 9):
-                            self.blosc_compression_level = compression_level_int
-                        else:
-                            raise ValueError("Invalid value for blosc_compression_level in configuration.\n"
-                                             "blosc_compression_level must be between 0 and 9.")
-                    else:
-                        raise TypeError("Invalid value for blosc_compression_level in configuration.\n"
-                                        "blosc_compression_level could not be converted to integer.")
-                if "blosc_shuffle_mode" in runtime_config.vcf_to_zarr:
-                    blosc_shuffle_mode_str = runtime_config.vcf_to_zarr["blosc_shuffle_mode"]
-                    if isint(blosc_shuffle_mode_str):
-                        blosc_shuffle_mode_int = int(blosc_shuffle_mode_str)
-                        if blosc_shuffle_mode_int in vcf_to_zarr_blosc_shuffle_types:
-                            self.blosc_shuffle_mode = blosc_shuffle_mode_int
-                        else:
-                            raise ValueError("Invalid value for blosc_shuffle_mode in configuration.\n"
-                                             "blosc_shuffle_mode must be a valid integer.")
-                    else:
-                        raise TypeError("Invalid value for blosc_shuffle_mode in configuration.\n"
-                                        "blosc_shuffle_mode could not be converted to integer.")
+        self.enabled = False  # Specifies whether the VCF to Zarr conversion module should be enabled or not
+        self.fields = None
+        self.alt_number = None  # Alt number to use when converting to Zarr format. If None, determined automatically
+        self.chunk_length = None  # Number of variants of chunks in which data are processed. If None, use default
+        # value. If "auto", scale the default down with the sample count of the input VCF file
+        self.chunk_width = None  # Number of samples to use when storing chunks in output. If None, use default
+        # value. If "auto", cover all samples of the input VCF file up to a bounded width
+        self.buffer_size = None  # Size (in bytes) of the VCF read buffer. If None, use default value
+        self.compressor = "Blosc"  # Specifies compressor type to use for Zarr conversion
+        self.blosc_compression_algorithm = "zstd"
+        self.blosc_compression_level = 3  # Level of compression to use for Zarr conversion
+        self.blosc_shuffle_mode = Blosc.BITSHUFFLE
+        self.blosc_blocksize = 0  # Blosc block size in bytes. If 0, Blosc chooses automatically
+        self.blosc_nthreads = None  # Number of Blosc compression threads. If None, determined from CPU count
+
+        # Check if [vcf_to_zarr] section exists in config
+        section = getattr(runtime_config, "vcf_to_zarr", None) if runtime_config is not None else None
+        if section is None:
+            return
+
+        # Extract relevant settings from the section dictionary
+        self.enabled = config_str_to_bool(section.get("enabled", "false"))
+
+        alt_number_str = section.get("alt_number")
+        if alt_number_str is not None:
+            if str(alt_number_str).lower() == "auto":
+                self.alt_number = None
+            elif isint(alt_number_str):
+                self.alt_number = int(alt_number_str)
+            else:
+                raise TypeError("Invalid value provided for alt_number in configuration.\n"
+                                "Expected: \"auto\" or integer value")
+
+        chunk_length_str = section.get("chunk_length")
+        if chunk_length_str is not None:
+            if chunk_length_str == "default":
+                self.chunk_length = None
+            elif str(chunk_length_str).lower() == "auto":
+                self.chunk_length = "auto"
+            elif isint(chunk_length_str):
+                self.chunk_length = int(chunk_length_str)
+            else:
+                raise TypeError("Invalid value provided for chunk_length in configuration.\n"
+                                "Expected: \"default\", \"auto\", or integer value")
+
+        chunk_width_str = section.get("chunk_width")
+        if chunk_width_str is not None:
+            if chunk_width_str == "default":
+                self.chunk_width = None
+            elif str(chunk_width_str).lower() == "auto":
+                self.chunk_width = "auto"
+            elif isint(chunk_width_str):
+                self.chunk_width = int(chunk_width_str)
+            else:
+                raise TypeError("Invalid value provided for chunk_width in configuration.\n"
+                                "Expected: \"default\", \"auto\", or integer value")
+
+        buffer_size_str = section.get("buffer_size")
+        if buffer_size_str is not None:
+            if buffer_size_str == "default":
+                self.buffer_size = None
+            elif isint(buffer_size_str) and int(buffer_size_str) > 0:
+                self.buffer_size = int(buffer_size_str)
+            else:
+                raise TypeError("Invalid value provided for buffer_size in configuration.\n"
+                                "Expected: \"default\" or positive integer value")
+
+        compressor_temp = section.get("compressor")
+        # Ensure compressor type specified is valid
+        if compressor_temp in vcf_to_zarr_compressor_types:
+            self.compressor = compressor_temp
+
+        blosc_compression_algorithm_temp = section.get("blosc_compression_algorithm")
+        if blosc_compression_algorithm_temp in vcf_to_zarr_blosc_algorithm_types:
+            self.blosc_compression_algorithm = blosc_compression_algorithm_temp
+
+        blosc_compression_level_str = section.get("blosc_compression_level")
+        if blosc_compression_level_str is not None:
+            if isint(blosc_compression_level_str):
+                compression_level_int = int(blosc_compression_level_str)
+                if (compression_level_int >= 0) and (compression_level_int <= 9):
+                    self.blosc_compression_level = compression_level_int
+                else:
+                    raise ValueError("Invalid value for blosc_compression_level in configuration.\n"
+                                     "blosc_compression_level must be between 0 and 9.")
+            else:
+                raise TypeError("Invalid value for blosc_compression_level in configuration.\n"
+                                "blosc_compression_level could not be converted to integer.")
+
+        blosc_shuffle_mode_str = section.get("blosc_shuffle_mode")
+        if blosc_shuffle_mode_str is not None:
+            if isint(blosc_shuffle_mode_str):
+                blosc_shuffle_mode_int = int(blosc_shuffle_mode_str)
+                if blosc_shuffle_mode_int in vcf_to_zarr_blosc_shuffle_types:
+                    self.blosc_shuffle_mode = blosc_shuffle_mode_int
+                else:
+                    raise ValueError("Invalid value for blosc_shuffle_mode in configuration.\n"
+                                     "blosc_shuffle_mode must be a valid integer.")
+            else:
+                raise TypeError("Invalid value for blosc_shuffle_mode in configuration.\n"
+                                "blosc_shuffle_mode could not be converted to integer.")
+
+        blosc_blocksize_str = section.get("blosc_blocksize")
+        if blosc_blocksize_str is not None:
+            if str(blosc_blocksize_str).lower() == "auto":
+                self.blosc_blocksize = 0
+            elif isint(blosc_blocksize_str) and int(blosc_blocksize_str) >= 0:
+                self.blosc_blocksize = int(blosc_blocksize_str)
+            else:
+                raise ValueError("Invalid value for blosc_blocksize in configuration.\n"
+                                 "blosc_blocksize must be \"auto\" or a non-negative integer\n"
+                                 "(0 lets Blosc choose the block size automatically).")
+
+        blosc_nthreads_str = section.get("blosc_nthreads")
+        if blosc_nthreads_str is not None:
+            if str(blosc_nthreads_str).lower() == "auto":
+                self.blosc_nthreads = None
+            elif isint(blosc_nthreads_str) and int(blosc_nthreads_str) > 0:
+                self.blosc_nthreads = int(blosc_nthreads_str)
+            else:
+                raise ValueError("Invalid value for blosc_nthreads in configuration.\n"
+                                 "Expected: \"auto\" or integer value greater than 0.")
 
 
 class DaskSchedulerConfigurationRepresentation:
@@ -251,6 +315,7 @@ class BenchmarkConfigurationRepresentation:
     benchmark_num_variants = -1
     benchmark_num_samples = -1
     benchmark_aggregations = False
+    benchmark_aggregations_fused = True
     benchmark_pca = False
     genotype_array_type = GENOTYPE_ARRAY_DASK
     dask_genotype_array_chunk_variants = -1
@@ -262,6 +327,7 @@ class BenchmarkConfigurationRepresentation:
     pca_number_components = 10
     pca_data_scaler = benchmark_pca_data_scaler_types[PCA_DATA_SCALER_PATTERSON]
     pca_subset_size = 100000
+    pca_random_seed = None  # Seed for the random SNP subset. If None, a fresh seed is used each run
     pca_ld_enabled = False
     pca_ld_pruning_number_iterations = 2
     pca_ld_pruning_size = 100
@@ -308,6 +374,9 @@ class BenchmarkConfigurationRepresentation:
                                          "Alternatively, a value of -1 can be specified to include all samples.")
                 if "benchmark_aggregations" in runtime_config.benchmark:
                     self.benchmark_aggregations = config_str_to_bool(runtime_config.benchmark["benchmark_aggregations"])
+                if "benchmark_aggregations_fused" in runtime_config.benchmark:
+                    self.benchmark_aggregations_fused = config_str_to_bool(
+                        runtime_config.benchmark["benchmark_aggregations_fused"])
                 if "benchmark_pca" in runtime_config.benchmark:
                     self.benchmark_pca = config_str_to_bool(runtime_config.benchmark["benchmark_pca"])
                 if "genotype_array_type" in runtime_config.benchmark:
@@ -370,6 +439,15 @@ class BenchmarkConfigurationRepresentation:
                         raise ValueError("Invalid value for pca_subset_size in configuration.\n"
                                          "pca_subset_size must be a valid integer greater than 0.\n"
                                          "Additionally, a value of -1 can be used to include all samples.")
+                if "pca_random_seed" in runtime_config.benchmark:
+                    pca_random_seed_str = runtime_config.benchmark["pca_random_seed"]
+                    if str(pca_random_seed_str).lower() == "none":
+                        self.pca_random_seed = None
+                    elif isint(pca_random_seed_str) and int(pca_random_seed_str) >= 0:
+                        self.pca_random_seed = int(pca_random_seed_str)
+                    else:
+                        raise ValueError("Invalid value for pca_random_seed in configuration.\n"
+                                         "pca_random_seed must be \"none\" or a non-negative integer.")
                 if "pca_ld_enabled" in runtime_config.benchmark:
                     self.pca_ld_enabled = config_str_to_bool(runtime_config.benchmark["pca_ld_enabled"])
                 if "pca_ld_pruning_number_iterations" in runtime_config.benchmark:
@@ -413,6 +491,8 @@ class OutputConfigurationRepresentation:
     output_csv_enabled = True
     output_csv_delimiter = '|'
 
+    output_feather_enabled = False
+
     output_influxdb_enabled = False
     output_influxdb_host = 'localhost'
     output_influxdb_port = 8086
@@ -438,6 +518,13 @@ class OutputConfigurationRepresentation:
                 if 'delimiter' in config_output_csv:
                     self.output_csv_delimiter = config_output_csv['delimiter']
 
+            # Check if settings exist for [output.feather] module
+            if hasattr(runtime_config, 'output.feather'):
+                # Extract relevant settings from config file
+                config_output_feather = runtime_config['output.feather']
+                if 'enabled' in config_output_feather:
+                    self.output_feather_enabled = config_str_to_bool(config_output_feather['enabled'])
+
             # Check if settings exist for [output.csv] module
             if hasattr(runtime_config, 'output.influxdb'):
                 # Extract relevant settings from config file
@@ -477,7 +564,7 @@ def read_configuration(location):
 
 def generate_default_config_file(output_location, overwrite=False):
     # Get Default Config File Data as Package Resource
-    default_config_file_data = resource_string(__name__, 'config/benchmark.conf.default')
+    default_config_file_data = files(__package__).joinpath('config/benchmark.conf.default').read_bytes()
 
     if overwrite is None:
         overwrite = False
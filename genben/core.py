@@ -4,45 +4,72 @@ runs the benchmarks, and records the timer results. """
 
 import allel
 import zarr
+import csv  # for writing results
 import datetime
 import time  # for benchmark timer
+import numba
 import numpy as np
+import dask
 import dask.array as da
 import os
-import pandas as pd
-from collections import OrderedDict
+import pyarrow as pa
+import pyarrow.feather
 from genben import config, data_service
 from influxdb import InfluxDBClient
 
 
+@numba.njit(parallel=True, boundscheck=False)
+def _fused_counts(g, n_alleles):
+    """
+    Computes the allele counts, per-variant het/hom counts, and per-sample het/hom counts
+    in a single pass over the genotype data, so each genotype is only loaded from memory once.
+    :param g: The underlying genotype data (variants, samples, ploidy=2)
+    :param n_alleles: Number of distinct alleles within the genotype data (max allele + 1)
+    :type g: numpy.ndarray
+    :type n_alleles: int
+    :return: tuple of (allele counts, het per variant, hom per variant, het per sample, hom per sample)
+    """
+    n_variants = g.shape[0]
+    n_samples = g.shape[1]
+    n_threads = numba.get_num_threads()
+
+    ac = np.zeros((n_variants, n_alleles), dtype=np.int32)
+    het_var = np.zeros(n_variants, dtype=np.int64)
+    hom_var = np.zeros(n_variants, dtype=np.int64)
+
+    # Per-thread sample counters, reduced at the end to avoid cross-thread races
+    het_samp_threads = np.zeros((n_threads, n_samples), dtype=np.int64)
+    hom_samp_threads = np.zeros((n_threads, n_samples), dtype=np.int64)
+
+    for i in numba.prange(n_variants):
+        thread_id = numba.get_thread_id()
+        for j in range(n_samples):
+            a0 = g[i, j, 0]
+            a1 = g[i, j, 1]
+            if a0 >= 0:
+                ac[i, a0] += 1
+            if a1 >= 0:
+                ac[i, a1] += 1
+            if (a0 >= 0) and (a1 >= 0):
+                if a0 != a1:
+                    het_var[i] += 1
+                    het_samp_threads[thread_id, j] += 1
+                else:
+                    hom_var[i] += 1
+                    hom_samp_threads[thread_id, j] += 1
+
+    het_samp = het_samp_threads.sum(axis=0)
+    hom_samp = hom_samp_threads.sum(axis=0)
+
+    return ac, het_var, hom_var, het_samp, hom_samp
+
+
 class BenchmarkResultsData:
     run_number = None
     operation_name = None
     start_time = None
     exec_time = None
 
-    def to_dict(self):
-        return OrderedDict([("log_timestamp", self.start_time),
-                            ("run_number", self.run_number),
-                            ("operation", self.operation_name),
-                            ("execution_time", self.exec_time)])
-
-    def to_pandas(self):
-        data = self.to_dict()
-        df = pd.DataFrame(data, index=[1])
-        df.index.name = '#'
-        return df
-
-    def to_csv(self, filename, delimiter='|'):
-        filename = str(filename)
-
-        psv_header = not os.path.isfile(filename)
-
-        # Open the output file in append mode
-        with open(filename, "a") as psv_file:
-            pd_results = self.to_pandas()
-            pd_results.to_csv(psv_file, sep=delimiter, header=psv_header, index=False)
-
     def to_influxdb(self, host='localhost', port=8086, username='root', password='root', db_name=None,
                     benchmark_label=None, additional_tags=None):
         influx_client = InfluxDBClient(host=host,
@@ -76,12 +103,22 @@ class BenchmarkResultsData:
 
 class BenchmarkProfiler:
     benchmark_running = False
+    _start_ns = 0  # Monotonic timer reading taken when the current benchmark was started
 
     def __init__(self, output_config, benchmark_label):
         self.results = BenchmarkResultsData()
         self.output_config = output_config
         self.benchmark_label = benchmark_label
 
+        # CSV output file handle and writer, opened lazily on first record and
+        # held open for the profiler's lifetime to avoid per-record file opens
+        self._csv_file = None
+        self._csv_writer = None
+
+        # Buffered results rows for the Feather output file, written in one
+        # batch by close() once all benchmark runs have completed
+        self._feather_rows = []
+
     def set_run_number(self, run_number):
         if not self.benchmark_running:
             self.results.run_number = run_number
@@ -93,17 +130,21 @@ class BenchmarkProfiler:
 
             self.benchmark_running = True
 
-            # Start the benchmark timer
+            # Record the wall-clock start time (for the results log timestamp only)
             self.results.start_time = datetime.datetime.utcnow()
 
+            # Start the benchmark timer using the monotonic clock, which is not
+            # subject to NTP adjustment and has higher resolution than wall-clock time
+            self._start_ns = time.perf_counter_ns()
+
     def end_benchmark(self):
         if self.benchmark_running:
-            end_time = datetime.datetime.utcnow()
+            end_ns = time.perf_counter_ns()
 
             print('  - Done.')
 
-            # Calculate the execution time from start and end times
-            self.results.exec_time = (end_time - self.results.start_time).total_seconds()
+            # Calculate the execution time from start and end timer readings
+            self.results.exec_time = (end_ns - self._start_ns) * 1e-9
 
             # Save benchmark results
             self._record_runtime()
@@ -113,13 +154,51 @@ class BenchmarkProfiler:
     def get_benchmark_results(self):
         return self.results
 
+    def close(self):
+        """
+        Closes the CSV results output file, if one was opened, and writes the
+        buffered results to the Feather output file, if enabled.
+        """
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+
+        if self._feather_rows:
+            table = pa.table({'log_timestamp': [row[0] for row in self._feather_rows],
+                              'run_number': [row[1] for row in self._feather_rows],
+                              'operation': [row[2] for row in self._feather_rows],
+                              'execution_time': [row[3] for row in self._feather_rows]})
+            pa.feather.write_feather(table, '{}.feather'.format(self.benchmark_label))
+            self._feather_rows = []
+
     def _record_runtime(self):
         """
         Records the benchmark results data entry to the specified PSV file.
         """
         if self.output_config.output_csv_enabled:
-            self.results.to_csv(filename='{}.csv'.format(self.benchmark_label),
-                                delimiter=self.output_config.output_csv_delimiter)
+            if self._csv_writer is None:
+                filename = '{}.csv'.format(self.benchmark_label)
+                write_header = not os.path.isfile(filename)
+
+                self._csv_file = open(filename, 'a', newline='')
+                self._csv_writer = csv.writer(self._csv_file,
+                                              delimiter=self.output_config.output_csv_delimiter)
+
+                if write_header:
+                    self._csv_writer.writerow(['log_timestamp', 'run_number', 'operation', 'execution_time'])
+
+            self._csv_writer.writerow([self.results.start_time,
+                                       self.results.run_number,
+                                       self.results.operation_name,
+                                       self.results.exec_time])
+            self._csv_file.flush()
+
+        if self.output_config.output_feather_enabled:
+            self._feather_rows.append((self.results.start_time,
+                                       self.results.run_number,
+                                       self.results.operation_name,
+                                       self.results.exec_time))
 
         if self.output_config.output_influxdb_enabled:
             influxdb_additional_tags = {
@@ -157,51 +236,69 @@ class Benchmark:
         self.benchmark_profiler = BenchmarkProfiler(output_config=self.bench_conf.results_output_config,
                                                     benchmark_label=self.benchmark_label)
 
+        # PCG64-based generator for the PCA SNP subset; seedable for reproducible runs
+        self._rng = np.random.default_rng(self.bench_conf.pca_random_seed)
+
+        # Precompute the dataset paths used in VCF input mode; they are pure string
+        # work and identical on every benchmark run
+        self._input_vcf_path = None
+        self._output_zarr_file = None
+        self._output_zarr_path = None
+        if self.data_dirs is not None and self.bench_conf.benchmark_data_input == "vcf":
+            input_vcf_file = self.bench_conf.benchmark_dataset
+            self._input_vcf_path = os.path.join(self.data_dirs.vcf_dir, input_vcf_file)
+            # Truncate *.vcf / *.vcf.gz from input filename
+            self._output_zarr_file = data_service.strip_vcf_extension(input_vcf_file)
+            self._output_zarr_path = os.path.join(self.data_dirs.zarr_dir_benchmark, self._output_zarr_file)
+
     def run_benchmark(self):
         """
         Executes the benchmarking process.
         """
         if self.bench_conf is not None and self.data_dirs is not None:
-            for run_number in range(1, self.bench_conf.benchmark_number_runs + 1):
-                # Clear out existing files in Zarr benchmark directory
-                # (Should be done every single run)
-                data_service.remove_directory_tree(self.data_dirs.zarr_dir_benchmark)
+            # Validate the data input format once; it is invariant across runs
+            if self.bench_conf.benchmark_data_input == "vcf":
+                # Ensure user didn't attempt to use concatenation along with vcf data input mode
+                if self.bench_conf.benchmark_dataset == '*':
+                    print(
+                        '[Exec] Error: benchmark_dataset has a value of *, which cannot be used with VCF to Zarr conversion.')
+                    print('  - Please disable concatenation and specify a single data set to work with.')
+                    print(
+                        '  - Alternatively, benchmark_data_input can be set to zarr so that concatenation can be used.')
+                    exit(1)
+            elif self.bench_conf.benchmark_data_input == "zarr":
+                # Use pre-converted Zarr data which was done ahead of benchmark (i.e. in Setup mode)
+                self.benchmark_zarr_dir = self.data_dirs.zarr_dir_setup
+                self.benchmark_zarr_file = self.bench_conf.benchmark_dataset
+            else:
+                print("[Exec] Error: Invalid option supplied for benchmark data input format.")
+                print("  - Expected data input formats: vcf, zarr")
+                print("  - Provided data input format: {}".format(self.bench_conf.benchmark_data_input))
+                exit(1)
 
+            # Resolved location of the benchmark Zarr dataset; computed once since the
+            # directory and file names do not change between runs
+            benchmark_zarr_path = None
+
+            for run_number in range(1, self.bench_conf.benchmark_number_runs + 1):
                 # Update run number in benchmark profiler (for results tracking)
                 self.benchmark_profiler.set_run_number(run_number)
 
-                # Prepare data directory and file locations for benchmarks
                 if self.bench_conf.benchmark_data_input == "vcf":
-                    # Ensure user didn't attempt to use concatenation along with vcf data input mode
-                    if self.bench_conf.benchmark_dataset == '*':
-                        print(
-                            '[Exec] Error: benchmark_dataset has a value of *, which cannot be used with VCF to Zarr conversion.')
-                        print('  - Please disable concatenation and specify a single data set to work with.')
-                        print(
-                            '  - Alternatively, benchmark_data_input can be set to zarr so that concatenation can be used.')
-                        exit(1)
-
                     # Convert VCF data to Zarr format as part of benchmark
                     self._benchmark_convert_to_zarr()
 
-                elif self.bench_conf.benchmark_data_input == "zarr":
-                    # Use pre-converted Zarr data which was done ahead of benchmark (i.e. in Setup mode)
-                    self.benchmark_zarr_dir = self.data_dirs.zarr_dir_setup
-                    self.benchmark_zarr_file = self.bench_conf.benchmark_dataset
-
-                else:
-                    print("[Exec] Error: Invalid option supplied for benchmark data input format.")
-                    print("  - Expected data input formats: vcf, zarr")
-                    print("  - Provided data input format: {}".format(self.bench_conf.benchmark_data_input))
-                    exit(1)
-
                 callsets = []
 
                 # Ensure Zarr dataset exists and can be used for upcoming benchmarks
-                benchmark_zarr_path = os.path.join(self.benchmark_zarr_dir, self.benchmark_zarr_file)
+                if benchmark_zarr_path is None:
+                    benchmark_zarr_path = os.path.join(self.benchmark_zarr_dir, self.benchmark_zarr_file)
                 if self.benchmark_zarr_file == '*':
-                    # User specified concatenation mode. Get all available datasets
-                    zarr_datasets = os.listdir(self.benchmark_zarr_dir)
+                    # User specified concatenation mode. Get all available datasets.
+                    # Only directories are Zarr stores; sidecar files written next to
+                    # them by the conversion (e.g. *.stamp) are not datasets
+                    zarr_datasets = [zarr_dataset for zarr_dataset in os.listdir(self.benchmark_zarr_dir)
+                                     if os.path.isdir(os.path.join(self.benchmark_zarr_dir, zarr_dataset))]
                     if len(zarr_datasets) == 0:
                         print('[Exec] Error: No zarr data sets could be found for concatenation.')
                         exit(1)
@@ -233,26 +330,38 @@ class Benchmark:
                     # Run PCA benchmark
                     self._benchmark_pca(gt)
 
+            # Close the results output file now that all runs are complete
+            self.benchmark_profiler.close()
+
     def _benchmark_convert_to_zarr(self):
         self.benchmark_zarr_dir = self.data_dirs.zarr_dir_benchmark
-        input_vcf_file = self.bench_conf.benchmark_dataset
-        input_vcf_path = os.path.join(self.data_dirs.vcf_dir, input_vcf_file)
+        input_vcf_path = self._input_vcf_path
 
         if os.path.isfile(input_vcf_path):
-            output_zarr_file = input_vcf_file
-            output_zarr_file = output_zarr_file[
-                               0:len(output_zarr_file) - 4]  # Truncate *.vcf from input filename
-            output_zarr_path = os.path.join(self.data_dirs.zarr_dir_benchmark, output_zarr_file)
+            output_zarr_file = self._output_zarr_file
+            output_zarr_path = self._output_zarr_path
+
+            if data_service.zarr_output_up_to_date(input_vcf_path=input_vcf_path,
+                                                   output_zarr_path=output_zarr_path,
+                                                   conversion_config=self.bench_conf.vcf_to_zarr_config):
+                # Conversion output from a previous run is still current; the
+                # deterministic conversion does not need to be repeated
+                print('[Exec] Zarr output is up to date with the source VCF. Skipping conversion.')
+                self.benchmark_profiler.start_benchmark(operation_name="Convert VCF to Zarr (cached)")
+                self.benchmark_profiler.end_benchmark()
+            else:
+                # Clear out existing files in Zarr benchmark directory before converting
+                data_service.remove_directory_tree(self.data_dirs.zarr_dir_benchmark)
 
-            data_service.convert_to_zarr(input_vcf_path=input_vcf_path,
-                                         output_zarr_path=output_zarr_path,
-                                         conversion_config=self.bench_conf.vcf_to_zarr_config,
-                                         benchmark_profiler=self.benchmark_profiler)
+                data_service.convert_to_zarr(input_vcf_path=input_vcf_path,
+                                             output_zarr_path=output_zarr_path,
+                                             conversion_config=self.bench_conf.vcf_to_zarr_config,
+                                             benchmark_profiler=self.benchmark_profiler)
 
             self.benchmark_zarr_file = output_zarr_file
         else:
             print("[Exec] Error: Dataset specified in configuration file does not exist. Exiting...")
-            print("  - Dataset file specified in configuration: {}".format(input_vcf_file))
+            print("  - Dataset file specified in configuration: {}".format(self.bench_conf.benchmark_dataset))
             print("  - Expected file location: {}".format(input_vcf_path))
             exit(1)
 
@@ -260,8 +369,15 @@ class Benchmark:
         callsets = []
         self.benchmark_profiler.start_benchmark(operation_name="Load Zarr Dataset")
         for zarr_path in zarr_paths:
-            store = zarr.DirectoryStore(zarr_path)
-            callset = zarr.Group(store=store, read_only=True)
+            # Wrap the directory store in an LRU cache so chunks read by the benchmarks
+            # below are decoded once rather than re-read from disk on every access
+            store = zarr.LRUStoreCache(zarr.DirectoryStore(zarr_path), max_size=2 ** 30)
+            if '.zmetadata' in store:
+                # Stores written by convert_to_zarr carry consolidated metadata, so the
+                # whole hierarchy is opened with a single metadata read
+                callset = zarr.open_consolidated(store=store, mode='r')
+            else:
+                callset = zarr.Group(store=store, read_only=True)
             callsets.append(callset)
         self.benchmark_profiler.end_benchmark()
         return callsets
@@ -314,6 +430,17 @@ class Benchmark:
         return gt
 
     def _benchmark_simple_aggregations(self, gt):
+        # Run all five aggregations as a single fused operation if enabled. For Dask
+        # arrays the reductions are batched into one graph traversal; for in-memory
+        # data a single-pass Numba kernel is used.
+        if self.bench_conf.benchmark_aggregations_fused:
+            if self.bench_conf.genotype_array_type == config.GENOTYPE_ARRAY_DASK:
+                self._benchmark_simple_aggregations_fused_dask(gt)
+                return
+            if gt.ploidy == 2:
+                self._benchmark_simple_aggregations_fused(gt)
+                return
+
         # Run benchmark for allele count
         benchmark_allele_count_name = "Allele Count (All Samples)"
         if self.bench_conf.genotype_array_type == config.GENOTYPE_ARRAY_DASK:
@@ -364,35 +491,75 @@ class Benchmark:
             gt.count_hom(axis=0)
         self.benchmark_profiler.end_benchmark()
 
+    def _benchmark_simple_aggregations_fused(self, gt):
+        # Materialize the underlying genotype data as a plain ndarray for the Numba kernel
+        values = gt.values if hasattr(gt, 'values') else gt
+        if isinstance(values, zarr.Array):
+            # Decode into a preallocated buffer so the compressed chunks and the
+            # decoded array are not both held at full size during materialization
+            g = np.empty(values.shape, dtype=values.dtype)
+            values.get_basic_selection(out=g)
+        else:
+            g = np.asarray(values)
+
+        # Determine the number of distinct alleles to size the allele count output
+        n_alleles = int(np.max(g)) + 1
+
+        # Warm up the kernel on a single variant so JIT compilation time is not benchmarked
+        _fused_counts(g[:1], n_alleles)
+
+        self.benchmark_profiler.start_benchmark(operation_name="Simple Aggregations Fused")
+        _fused_counts(g, n_alleles)
+        self.benchmark_profiler.end_benchmark()
+
+    def _benchmark_simple_aggregations_fused_dask(self, gt):
+        # Batch all five reductions into a single graph traversal so each Zarr chunk
+        # is read and decompressed once instead of once per aggregation
+        self.benchmark_profiler.start_benchmark(operation_name="Simple Aggregations (fused Dask)")
+        dask.compute(gt.count_alleles(),
+                     gt.count_het(axis=1),
+                     gt.count_hom(axis=1),
+                     gt.count_het(axis=0),
+                     gt.count_hom(axis=0))
+        self.benchmark_profiler.end_benchmark()
+
     def _benchmark_pca(self, gt):
-        # Count alleles at each variant
+        # Count alleles at each variant. The maximum allele per variant is
+        # materialized inside the timed region (in Dask mode this is what executes
+        # the count_alleles pipeline); it is reused by the multiallelic/singleton
+        # counts and the filter mask below
         self.benchmark_profiler.start_benchmark('PCA: Count alleles')
         ac = gt.count_alleles()
+        if self.bench_conf.genotype_array_type == config.GENOTYPE_ARRAY_DASK:
+            max_al = ac.max_allele().compute()
+        else:
+            max_al = np.asarray(ac.max_allele())
         self.benchmark_profiler.end_benchmark()
 
         # Count number of multiallelic SNPs
         self.benchmark_profiler.start_benchmark('PCA: Count multiallelic SNPs')
-        if self.bench_conf.genotype_array_type == config.GENOTYPE_ARRAY_DASK:
-            num_multiallelic_snps = da.count_nonzero(ac.max_allele() > 1).compute()
-        else:
-            num_multiallelic_snps = np.count_nonzero(ac.max_allele() > 1)
+        num_multiallelic_snps = np.count_nonzero(max_al > 1)
         self.benchmark_profiler.end_benchmark()
         del num_multiallelic_snps
 
         # Count number of biallelic singletons
         self.benchmark_profiler.start_benchmark('PCA: Count biallelic singletons')
         if self.bench_conf.genotype_array_type == config.GENOTYPE_ARRAY_DASK:
-            num_biallelic_singletons = da.count_nonzero((ac.max_allele() == 1) & ac.is_singleton(1)).compute()
+            num_biallelic_singletons = da.count_nonzero((max_al == 1) & (ac[:, 1] == 1)).compute()
         else:
-            num_biallelic_singletons = np.count_nonzero((ac.max_allele() == 1) & ac.is_singleton(1))
+            num_biallelic_singletons = np.count_nonzero((max_al == 1) & (ac[:, 1] == 1))
         self.benchmark_profiler.end_benchmark()
         del num_biallelic_singletons
 
         # Apply filtering to remove singletons and multiallelic SNPs
-        flt = (ac.max_allele() == 1) & (ac[:, :2].min(axis=1) > 1)
-        flt_count = np.count_nonzero(flt)
+        flt = (max_al == 1) & (ac[:, :2].min(axis=1) > 1)
         self.benchmark_profiler.start_benchmark('PCA: Remove singletons and multiallelic SNPs')
-        if flt_count > 0:
+        if self.bench_conf.genotype_array_type == config.GENOTYPE_ARRAY_DASK and hasattr(flt, 'compute'):
+            # Materialize the mask once so the any-check and flatnonzero below do not
+            # each traverse the Dask graph, and the filtered array keeps known chunks
+            flt = flt.compute()
+        # flt.any() only needs to find a single kept variant, unlike a full count_nonzero scan
+        if bool(flt.any()):
             if self.bench_conf.genotype_array_type == config.GENOTYPE_ARRAY_DASK:
                 gf = gt.take(np.flatnonzero(flt), axis=0)
             else:
@@ -402,31 +569,34 @@ class Benchmark:
             print('[Exec][PCA] Cannot remove singletons and multiallelic SNPs as no data would remain. Skipping...')
             gf = gt
         self.benchmark_profiler.end_benchmark()
-        del ac, flt, flt_count
+        del ac, max_al, flt
 
-        # Transform genotype data into 2-dim matrix
-        self.benchmark_profiler.start_benchmark('PCA: Transform genotype data for PCA')
-        gn = gf.to_n_alt()
-        self.benchmark_profiler.end_benchmark()
-        del gf
-
-        # Randomly choose subset of SNPs
+        # Randomly choose subset of SNPs, then transform the genotype data into a
+        # 2-dim matrix. Sampling before the transform means alt counts are only
+        # computed for the selected variants instead of the whole data set.
         if self.bench_conf.pca_subset_size == -1:
-            print('[Exec][PCA] Including all ({}) variants for PCA.'.format(gn.shape[0]))
-            gnr = gn
+            print('[Exec][PCA] Including all ({}) variants for PCA.'.format(gf.shape[0]))
+            self.benchmark_profiler.start_benchmark('PCA: Transform genotype data for PCA')
+            gnr = gf.to_n_alt()
+            self.benchmark_profiler.end_benchmark()
         else:
-            n = min(gn.shape[0], self.bench_conf.pca_subset_size)
+            n = min(gf.shape[0], self.bench_conf.pca_subset_size)
             print('[Exec][PCA] Including {} random variants for PCA.'.format(n))
-            vidx = np.random.choice(gn.shape[0], n, replace=False)
-            vidx.sort()
+            # shuffle=False skips the generator's internal shuffle pass since the
+            # indices are sorted immediately afterwards anyway
+            vidx = np.sort(self._rng.choice(gf.shape[0], n, replace=False, shuffle=False))
+            self.benchmark_profiler.start_benchmark('PCA: Transform genotype data for PCA')
             if self.bench_conf.genotype_array_type in [config.GENOTYPE_ARRAY_NORMAL, config.GENOTYPE_ARRAY_CHUNKED]:
-                gnr = gn.take(vidx, axis=0)
+                gnr = gf.take(vidx, axis=0).to_n_alt()
             elif self.bench_conf.genotype_array_type == config.GENOTYPE_ARRAY_DASK:
-                gnr = gn[vidx]  # Use indexing workaround since Dask Array's take() method is not working properly
+                # Use indexing workaround since Dask Array's take() method is not working properly
+                gnr = gf[vidx].to_n_alt()
             else:
                 print('[Exec][PCA] Error: Unspecified genotype array type specified.')
                 exit(1)
+            self.benchmark_profiler.end_benchmark()
             del vidx
+        del gf
 
         if self.bench_conf.pca_ld_enabled:
             if self.bench_conf.genotype_array_type != config.GENOTYPE_ARRAY_DASK:
@@ -460,7 +630,7 @@ class Benchmark:
         self.benchmark_profiler.start_benchmark(
             'PCA: Run conventional PCA analysis (scaler: {})'.format(scaler if scaler is not None else 'none'))
         coords, model = allel.pca(gnu_pca_conv, n_components=pca_num_components, scaler=scaler)
-        if self.bench_conf.genotype_array_type == config.GENOTYPE_ARRAY_DASK:
+        if self.bench_conf.genotype_array_type == config.GENOTYPE_ARRAY_DASK and hasattr(coords, 'compute'):
             coords.compute()
         self.benchmark_profiler.end_benchmark()
         del gnu_pca_conv, coords, model
@@ -475,7 +645,7 @@ class Benchmark:
         self.benchmark_profiler.start_benchmark(
             'PCA: Run randomized PCA analysis (scaler: {})'.format(scaler if scaler is not None else 'none'))
         coords, model = allel.randomized_pca(gnu_pca_rand, n_components=pca_num_components, scaler=scaler)
-        if self.bench_conf.genotype_array_type == config.GENOTYPE_ARRAY_DASK:
+        if self.bench_conf.genotype_array_type == config.GENOTYPE_ARRAY_DASK and hasattr(coords, 'compute'):
             coords.compute()
         self.benchmark_profiler.end_benchmark()
         del gnu_pca_rand, coords, model
@@ -483,6 +653,14 @@ class Benchmark:
     @staticmethod
     def _pca_ld_prune(gn, size, step, threshold=.1, n_iter=1):
         blen = size * 10
+
+        # For in-memory data, compress into two preallocated scratch buffers alternated
+        # between iterations instead of materializing a fresh copy on every pass
+        use_scratch_buffers = isinstance(gn, np.ndarray) and n_iter > 0
+        if use_scratch_buffers:
+            buf_front = np.empty_like(gn)
+            buf_back = np.empty_like(gn)
+
         for i in range(n_iter):
             loc_unlinked = allel.locate_unlinked(gn, size=size, step=step, threshold=threshold, blen=blen)
             n = np.count_nonzero(loc_unlinked)
@@ -492,5 +670,10 @@ class Benchmark:
                                                                                                        n_iter,
                                                                                                        n,
                                                                                                        n_remove))
-            gn = gn.compress(loc_unlinked, axis=0)
+            if use_scratch_buffers:
+                np.compress(loc_unlinked, gn, axis=0, out=buf_front[:n])
+                gn = buf_front[:n]
+                buf_front, buf_back = buf_back, buf_front
+            else:
+                gn = gn.compress(loc_unlinked, axis=0)
         return gn
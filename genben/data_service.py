@@ -2,24 +2,20 @@
 determines the runtime mode (dynamic vs. static); if dynamic, gets the benchmark data from the server,
 runs the benchmarks, and records the timer results. """
 
-import sys
-
-# Support Python 2.x and 3.x
-if sys.version_info[0] >= 3:
-    from urllib.request import urlretrieve
-else:
-    from urllib import urlretrieve
-
 from ftplib import FTP, FTP_TLS, error_perm
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import ssl
+import threading
 import time  # for benchmark timer
 import csv  # for writing results
 import logging
 import os.path
-import pathlib
 import allel
 import allel.io.vcf_read
 import sys
 import functools
+import urllib.request
+import fsspec
 import numpy as np
 import dask.array as da
 import zarr
@@ -30,6 +26,13 @@ from genben import config
 import gzip
 import shutil
 
+# Optional multi-threaded gzip decompressor; decompression of *.vcf.gz input is
+# CPU-bound and single-threaded through the standard library's gzip module
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
 
 def create_directory_tree(path):
     """
@@ -37,11 +40,9 @@ def create_directory_tree(path):
     :param path: The path to create dirs/subdirs for
     :type path: str
     """
-    path = str(path)  # Ensure path is in str format
-    try:
-        pathlib.Path(path).mkdir(parents=True)
-    except OSError:  # Catch if directory already exists
-        pass
+    # exist_ok tolerates an existing directory without masking real errors
+    # (e.g. permission denied) the way a broad OSError catch would
+    os.makedirs(str(path), exist_ok=True)
 
 
 def remove_directory_tree(path):
@@ -55,8 +56,73 @@ def remove_directory_tree(path):
         shutil.rmtree(path, ignore_errors=True)
 
 
+# Maximum number of parallel FTP connections to open when downloading an explicit file list
+FTP_MAX_PARALLEL_DOWNLOADS = 8
+
+# Data block size (in bytes) for FTP transfers. ftplib's 8 KiB default pays syscall
+# overhead per block; larger blocks amortize it across more bytes received
+FTP_BLOCK_SIZE = 256 * 1024
+
+# Buffer size (in bytes) for the local file a FTP download is written to,
+# so disk writes are coalesced regardless of the network block size
+FTP_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def ftp_login(ftp_config):
+    """ Opens and logs into a new FTP (or FTPS) connection based on the FTP configuration.
+    :type ftp_config: config.FTPConfigurationRepresentation
+    :return: ftplib.FTP
+    """
+    if ftp_config.use_tls:
+        ftp = FTP_TLS(ftp_config.server)
+        ftp.login(ftp_config.username, ftp_config.password)
+        ftp.prot_p()  # Request secure data connection for file retrieval
+    else:
+        ftp = FTP(ftp_config.server)
+        ftp.login(ftp_config.username, ftp_config.password)
+    # Switch the connection to binary mode once; retrbinary_fast relies on this
+    # instead of re-sending the TYPE I handshake before every transfer
+    ftp.voidcmd('TYPE I')
+    ftp.binary_mode = True
+    return ftp
+
+
+def retrbinary_fast(ftp, cmd, callback, blocksize=FTP_BLOCK_SIZE):
+    """
+    Retrieves a file in binary mode like ftplib's retrbinary, but without the TYPE I
+    round-trip ftplib issues before every transfer; the connection is switched to
+    binary mode once at login by ftp_login instead, and re-armed only after a
+    listing command has put the connection back into ASCII mode.
+    :param ftp: The logged-in FTP connection to retrieve the file over
+    :param cmd: The retrieval command to send (e.g. "RETR filename")
+    :param callback: Callable invoked with each block of data received
+    :param blocksize: Data block size (in bytes) to use for the transfer
+    :type ftp: ftplib.FTP
+    :type cmd: str
+    :type callback: callable
+    :type blocksize: int
+    :return: str
+    """
+    # ftplib's listing helpers (e.g. mlsd, which runs over retrlines) send TYPE A
+    # before each listing, so a transfer after one would run in ASCII mode and
+    # corrupt binary data with CRLF translation. Restore binary mode if it was lost
+    if not getattr(ftp, 'binary_mode', False):
+        ftp.voidcmd('TYPE I')
+        ftp.binary_mode = True
+    with ftp.transfercmd(cmd) as conn:
+        while True:
+            data = conn.recv(blocksize)
+            if not data:
+                break
+            callback(data)
+        # Shut down the TLS layer cleanly if this is a secure data connection
+        if isinstance(conn, ssl.SSLSocket):
+            conn.unwrap()
+    return ftp.voidresp()
+
+
 def fetch_data_via_ftp(ftp_config, local_directory):
-    """ Get benchmarking data from a remote ftp server. 
+    """ Get benchmarking data from a remote ftp server.
     :type ftp_config: config.FTPConfigurationRepresentation
     :type local_directory: str
     """
@@ -64,47 +130,74 @@ def fetch_data_via_ftp(ftp_config, local_directory):
         # Create local directory tree if it does not exist
         create_directory_tree(local_directory)
 
-        # Login to FTP server
-        if ftp_config.use_tls:
-            ftp = FTP_TLS(ftp_config.server)
-            ftp.login(ftp_config.username, ftp_config.password)
-            ftp.prot_p()  # Request secure data connection for file retrieval
-        else:
-            ftp = FTP(ftp_config.server)
-            ftp.login(ftp_config.username, ftp_config.password)
-
         if not ftp_config.files:  # Auto-download all files in directory
+            ftp = ftp_login(ftp_config)
             fetch_data_via_ftp_recursive(ftp=ftp,
                                          local_directory=local_directory,
                                          remote_directory=ftp_config.directory)
+            ftp.close()
         else:
-            ftp.cwd(ftp_config.directory)
-
-            file_counter = 1
+            # Download the file list over parallel connections. Each worker thread logs
+            # into its own FTP session (reused across files), so transfers overlap
+            # instead of paying each RETR's latency back to back.
             file_list_total = len(ftp_config.files)
+            max_workers = min(FTP_MAX_PARALLEL_DOWNLOADS, file_list_total)
+            thread_data = threading.local()
+            connections = []
+            connections_lock = threading.Lock()
+
+            def download_one(remote_filename):
+                filepath = os.path.join(local_directory, remote_filename)
+                if os.path.exists(filepath):
+                    return 'exists', filepath
+
+                # Reuse this worker thread's connection, logging in on first use
+                ftp = getattr(thread_data, 'ftp', None)
+                if ftp is None:
+                    ftp = ftp_login(ftp_config)
+                    ftp.cwd(ftp_config.directory)
+                    thread_data.ftp = ftp
+                    with connections_lock:
+                        connections.append(ftp)
+
+                with open(filepath, "wb", buffering=FTP_WRITE_BUFFER_SIZE) as local_file:
+                    try:
+                        retrbinary_fast(ftp, 'RETR %s' % remote_filename, local_file.write)
+                        return 'downloaded', filepath
+                    except error_perm:
+                        # Error downloading file. Delete the partial local file
+                        local_file.close()
+                        os.remove(filepath)
+                        return 'error', filepath
 
-            for remote_filename in ftp_config.files:
-                local_filename = remote_filename
-                filepath = os.path.join(local_directory, local_filename)
-                if not os.path.exists(filepath):
-                    with open(filepath, "wb") as local_file:
-                        try:
-                            ftp.retrbinary('RETR %s' % remote_filename, local_file.write)
-                            print("[Setup][FTP] ({}/{}) File downloaded: {}".format(file_counter, file_list_total,
-                                                                                    filepath))
-                        except error_perm:
-                            # Error downloading file. Display error message and delete local file
-                            print("[Setup][FTP] ({}/{}) Error downloading file. Skipping: {}".format(file_counter,
-                                                                                                     file_list_total,
-                                                                                                     filepath))
-                            local_file.close()
-                            os.remove(filepath)
+            try:
+                if max_workers <= 1:
+                    results = map(download_one, ftp_config.files)
                 else:
-                    print("[Setup][FTP] ({}/{}) File already exists. Skipping: {}".format(file_counter, file_list_total,
-                                                                                          filepath))
-                file_counter = file_counter + 1
-        # Close FTP connection
-        ftp.close()
+                    executor = ThreadPoolExecutor(max_workers=max_workers)
+                    with executor:
+                        futures = [executor.submit(download_one, remote_filename)
+                                   for remote_filename in ftp_config.files]
+                        results = (future.result() for future in as_completed(futures))
+
+                file_counter = 1
+                for status, filepath in results:
+                    if status == 'downloaded':
+                        print("[Setup][FTP] ({}/{}) File downloaded: {}".format(file_counter, file_list_total,
+                                                                                filepath))
+                    elif status == 'error':
+                        print("[Setup][FTP] ({}/{}) Error downloading file. Skipping: {}".format(file_counter,
+                                                                                                 file_list_total,
+                                                                                                 filepath))
+                    else:
+                        print("[Setup][FTP] ({}/{}) File already exists. Skipping: {}".format(file_counter,
+                                                                                              file_list_total,
+                                                                                              filepath))
+                    file_counter = file_counter + 1
+            finally:
+                # Close all worker connections
+                for ftp in connections:
+                    ftp.close()
 
 
 def fetch_data_via_ftp_recursive(ftp, local_directory, remote_directory, remote_subdirs_list=None):
@@ -133,118 +226,171 @@ def fetch_data_via_ftp_recursive(ftp, local_directory, remote_directory, remote_
     except error_perm:  # Invalid Entry
         print("[Setup][FTP] Error: Could not change to: {}".format(remote_path_absolute))
 
-    ftp.cwd(remote_path_absolute)
-
-    # Get list of remote files/folders in current directory
-    file_list = ftp.nlst()
+    # Get list of remote files/folders in current directory. A single MLSD round-trip
+    # returns each entry together with its type, so no per-entry cwd probe is needed
+    # to distinguish files from directories
+    try:
+        file_list = [(entry_name, entry_facts.get("type"), entry_facts.get("size"))
+                     for entry_name, entry_facts in ftp.mlsd(remote_path_absolute)
+                     if entry_facts.get("type") not in ("cdir", "pdir")]
+    except error_perm:
+        print("[Setup][FTP] Error: Could not list directory: {}".format(remote_path_absolute))
+        return
+    # mlsd switched the connection to ASCII mode; retrbinary_fast re-issues TYPE I
+    # before the next file transfer
+    ftp.binary_mode = False
 
     file_counter = 1
     file_list_total = len(file_list)
 
-    for file in file_list:
+    for file, entry_type, entry_size in file_list:
         file_path_local = local_directory + "/" + remote_path_relative + "/" + file
-        if not os.path.isfile(file_path_local):
-            try:
-                # Determine if a file or folder
-                ftp.cwd(remote_path_absolute + file)
-                # Path is for a folder. Run recursive function in new folder
-                print("[Setup][FTP] Switching to directory: {}".format(remote_path_relative + "/" + file))
-                new_remote_subdirs_list = remote_subdirs_list.copy()
-                new_remote_subdirs_list.append(file)
-                fetch_data_via_ftp_recursive(ftp=ftp, local_directory=local_directory,
-                                             remote_directory=remote_directory,
-                                             remote_subdirs_list=new_remote_subdirs_list)
-                # Return up one level since we are using recursion
-                ftp.cwd(remote_path_absolute)
-            except error_perm:
-                # file is an actual file. Download if it doesn't already exist on filesystem.
-                temp = ftp.nlst()
-                if not os.path.isfile(file_path_local):
-                    with open(file_path_local, "wb") as local_file:
-                        ftp.retrbinary('RETR {}'.format(file), local_file.write)
-                    print("[Setup][FTP] ({}/{}) File downloaded: {}".format(file_counter, file_list_total,
-                                                                            file_path_local))
-        else:
+        if entry_type == "dir":
+            # Path is for a folder. Run recursive function in new folder
+            print("[Setup][FTP] Switching to directory: {}".format(remote_path_relative + "/" + file))
+            new_remote_subdirs_list = remote_subdirs_list.copy()
+            new_remote_subdirs_list.append(file)
+            fetch_data_via_ftp_recursive(ftp=ftp, local_directory=local_directory,
+                                         remote_directory=remote_directory,
+                                         remote_subdirs_list=new_remote_subdirs_list)
+        elif os.path.isfile(file_path_local) and (entry_size is None or
+                                                  os.path.getsize(file_path_local) == int(entry_size)):
+            # Local copy is already complete (per the size fact from the MLSD listing,
+            # when the server reports one). Skip without any further FTP round-trip
             print("[Setup][FTP] ({}/{}) File already exists. Skipping: {}".format(file_counter, file_list_total,
                                                                                   file_path_local))
+        else:
+            # Entry is an actual file. Download since it is missing or incomplete locally
+            with open(file_path_local, "wb", buffering=FTP_WRITE_BUFFER_SIZE) as local_file:
+                retrbinary_fast(ftp, 'RETR {}'.format(remote_path_absolute + file), local_file.write)
+            print("[Setup][FTP] ({}/{}) File downloaded: {}".format(file_counter, file_list_total,
+                                                                    file_path_local))
         file_counter = file_counter + 1
 
 
 def fetch_file_from_url(url, local_file):
-    urlretrieve(url, local_file)
+    """
+    Downloads the file at the URL specified to the local file location. fsspec reads
+    the remote file in large blocks (and understands s3:// and other remote schemes
+    in addition to HTTP), instead of urlretrieve's small unresumable reads. When the
+    optional dependency fsspec needs for the URL scheme (e.g. aiohttp for HTTP) is
+    not installed, plain http/https URLs fall back to the standard library.
+    :param url: The URL to download the file from
+    :param local_file: The local file location to download the file to
+    :type url: str
+    :type local_file: str
+    """
+    try:
+        file_in = fsspec.open(url, 'rb', block_size=8 * 1024 * 1024).open()
+    except ImportError:
+        file_in = urllib.request.urlopen(url)
+    with file_in, open(local_file, 'wb') as file_out:
+        shutil.copyfileobj(file_in, file_out, 1024 * 1024)
+
+
+def open_vcf_file(vcf_path):
+    """
+    Opens a VCF file for binary reading, transparently decompressing *.vcf.gz input.
+    Decompression is parallelized across CPU cores when rapidgzip is installed,
+    falling back to the (single-threaded) standard library gzip module otherwise.
+    :param vcf_path: The VCF file location (*.vcf or *.vcf.gz)
+    :type vcf_path: str
+    :return: binary file-like object
+    """
+    vcf_path = str(vcf_path)
+    if vcf_path.endswith(".gz"):
+        if rapidgzip is not None:
+            return rapidgzip.open(vcf_path, parallelization=os.cpu_count() or 1)
+        return gzip.open(vcf_path, "rb")
+    return open(vcf_path, "rb")
 
 
-def decompress_gzip(local_file_gz, local_file):
-    with open(local_file, 'wb') as file_out, gzip.open(local_file_gz, 'rb') as file_in:
-        shutil.copyfileobj(file_in, file_out)
+def link_or_copy(src_path, dest_path):
+    """
+    Hardlinks src_path to dest_path, falling back to a byte copy when linking is not
+    possible (e.g. the paths are on different filesystems). On the same filesystem
+    the link is an O(1) metadata operation instead of re-writing the file's bytes.
+    :param src_path: The existing file to link or copy from
+    :param dest_path: The destination path to create
+    :type src_path: str
+    :type dest_path: str
+    """
+    if os.path.exists(dest_path):
+        os.remove(dest_path)
+    try:
+        os.link(src_path, dest_path)
+    except OSError:
+        # copyfile uses the kernel's zero-copy path (os.sendfile) where available and
+        # skips the permission/stat copy, which a fresh output file does not need
+        shutil.copyfile(src_path, dest_path)
+
+
+def scan_files(root_dir, suffixes):
+    """
+    Yields the paths of all files under root_dir (including subdirectories) whose
+    names end with any of the suffixes specified. A single os.scandir walk serves
+    every suffix at once, instead of one full glob pass (and its stat calls) per pattern.
+    :param root_dir: The directory to search for files in
+    :param suffixes: Filename suffix (or tuple of suffixes) to match files against
+    :type root_dir: str
+    :type suffixes: str or tuple
+    :return: generator of str
+    """
+    stack = [str(root_dir)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(suffixes):
+                    yield entry.path
+
+
+def strip_vcf_extension(filename):
+    """
+    Strips a trailing .vcf or .vcf.gz extension from the filename specified.
+    :param filename: The VCF filename to strip the extension from
+    :type filename: str
+    :return: str
+    """
+    return filename.removesuffix(".gz").removesuffix(".vcf")
 
 
 def process_data_files(input_dir, temp_dir, output_dir):
     """
-    Iterates through all files in input_dir and processes *.vcf.gz files to *.vcf, placed in output_dir.
-    Additionally moves *.vcf files to output_dir
+    Iterates through all files in input_dir and places *.vcf and *.vcf.gz files in output_dir.
+    Compressed files are kept compressed; scikit-allel streams *.vcf.gz input directly during
+    the Zarr conversion, so decompressing to an intermediate *.vcf would only double the disk I/O.
     Note: This method searches through all subdirectories within input_dir, and files are placed in root of output_dir.
     :param input_dir: The input directory containing files to process
-    :param temp_dir: The temporary directory for unzipping *.gz files, etc.
+    :param temp_dir: Unused; retained for call compatibility
     :param output_dir: The output directory where processed *.vcf files should go
     :type input_dir: str
     :type temp_dir: str
     :type output_dir: str
     """
 
-    # Ensure input, temp, and output directory paths are in str format, not pathlib
-    input_dir = str(input_dir)
-    temp_dir = str(temp_dir)
-    output_dir = str(output_dir)
-
-    # Create input, temp, and output directories if they do not exist
+    # Create input and output directories if they do not exist
     create_directory_tree(input_dir)
-    create_directory_tree(temp_dir)
     create_directory_tree(output_dir)
 
-    # Iterate through all *.gz files in input directory and uncompress them to the temporary directory
-    pathlist_gz = pathlib.Path(input_dir).glob("**/*.gz")
-    for path in pathlist_gz:
-        path_str = str(path)
-        file_output_str = path_leaf(path_str)
-        file_output_str = file_output_str[0:len(file_output_str) - 3]  # Truncate *.gz from input filename
-        path_temp_output = str(pathlib.Path(temp_dir, file_output_str))
-        print("[Setup][Data] Decompressing file: {}".format(path_str))
-        print("  - Output: {}".format(path_temp_output))
-
-        # Decompress the .gz file
-        decompress_gzip(path_str, path_temp_output)
-
-    # Iterate through all files in temporary directory and move *.vcf files to output directory
-    pathlist_vcf_temp = pathlib.Path(temp_dir).glob("**/*.vcf")
-    for path in pathlist_vcf_temp:
-        path_temp_str = str(path)
-        filename_str = path_leaf(path_temp_str)  # Strip filename from path
-        path_vcf_str = str(pathlib.Path(output_dir, filename_str))
-
-        shutil.move(path_temp_str, path_vcf_str)
-
-    # Remove temporary directory
-    remove_directory_tree(temp_dir)
-
-    # Copy any *.vcf files already in input directory to the output directory
-    pathlist_vcf_input = pathlib.Path(input_dir).glob("**/*.vcf")
-    for path in pathlist_vcf_input:
-        path_input_str = str(path)
-        filename_str = path_leaf(path_input_str)  # Strip filename from path
-        path_vcf_str = str(pathlib.Path(output_dir, filename_str))
-
-        shutil.copy(path_input_str, path_vcf_str)
-
-
-def path_head(path):
-    head, tail = os.path.split(path)
-    return head
-
-
-def path_leaf(path):
-    head, tail = os.path.split(path)
-    return tail or os.path.basename(head)
+    # Hardlink (or copy, across filesystems) *.vcf and *.vcf.gz files from the input
+    # directory to the output directory. The jobs are independent, so they are
+    # dispatched to a thread pool and overlap
+    copy_jobs = []
+    for path_input_str in scan_files(input_dir, (".vcf", ".vcf.gz")):
+        path_vcf_str = os.path.join(output_dir, os.path.basename(path_input_str))
+        copy_jobs.append((path_input_str, path_vcf_str))
+
+    if len(copy_jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(copy_jobs), os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(link_or_copy, path_input_str, path_vcf_str)
+                       for path_input_str, path_vcf_str in copy_jobs]
+            for future in as_completed(futures):
+                future.result()
+    else:
+        for path_input_str, path_vcf_str in copy_jobs:
+            link_or_copy(path_input_str, path_vcf_str)
 
 
 def read_file_contents(local_filepath):
@@ -267,28 +413,121 @@ def setup_vcf_to_zarr(input_vcf_dir, output_zarr_dir, conversion_config):
     :type output_zarr_dir: str
     :type conversion_config: config.VCFtoZarrConfigurationRepresentation
     """
-    # Ensure input and output directory paths are in str format, not pathlib
-    input_vcf_dir = str(input_vcf_dir)
-    output_zarr_dir = str(output_zarr_dir)
-
     # Create input and output directories if they do not exist
     create_directory_tree(input_vcf_dir)
     create_directory_tree(output_zarr_dir)
 
-    # Iterate through all *.vcf files in input directory and convert to Zarr format
-    pathlist_vcf = pathlib.Path(input_vcf_dir).glob("**/*.vcf")
-    for path in pathlist_vcf:
-        path_str = str(path)
-        file_output_str = path_leaf(path_str)
-        file_output_str = file_output_str[0:len(file_output_str) - 4]  # Truncate *.vcf from input filename
-        path_zarr_output = str(pathlib.Path(output_zarr_dir, file_output_str))
+    # Iterate through all *.vcf and *.vcf.gz files in input directory and convert to Zarr format.
+    # Compressed files are streamed through gzip by scikit-allel; no intermediate *.vcf is created
+    conversion_jobs = []
+    for path_str in scan_files(input_vcf_dir, (".vcf", ".vcf.gz")):
+        file_output_str = strip_vcf_extension(os.path.basename(path_str))  # Truncate *.vcf / *.vcf.gz from filename
+        path_zarr_output = os.path.join(output_zarr_dir, file_output_str)
         print("[Setup][Data] Converting VCF file to Zarr format: {}".format(path_str))
         print("  - Output: {}".format(path_zarr_output))
+        conversion_jobs.append((path_str, path_zarr_output))
+
+    if len(conversion_jobs) > 1:
+        # The conversions are independent, so fan them out across worker processes.
+        # Half the cores are used since each conversion already runs multithreaded
+        # Blosc compression internally
+        max_workers = min(len(conversion_jobs), max(1, (os.cpu_count() or 2) // 2))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(convert_to_zarr, path_str, path_zarr_output, conversion_config)
+                       for path_str, path_zarr_output in conversion_jobs]
+            for future in as_completed(futures):
+                future.result()
+    else:
+        for path_str, path_zarr_output in conversion_jobs:
+            convert_to_zarr(input_vcf_path=path_str,
+                            output_zarr_path=path_zarr_output,
+                            conversion_config=conversion_config)
+
+
+def vcf_to_zarr_stamp_data(input_vcf_path, conversion_config):
+    """
+    Builds the stamp data used to detect whether an existing Zarr output is up to date
+    with its source VCF file and conversion settings.
+    :param input_vcf_path: The input VCF file location
+    :param conversion_config: Configuration data for the conversion
+    :type input_vcf_path: str
+    :type conversion_config: config.VCFtoZarrConfigurationRepresentation
+    :return: str
+    """
+    vcf_stat = os.stat(input_vcf_path)
+    conversion_settings = repr((conversion_config.fields,
+                                conversion_config.alt_number,
+                                conversion_config.chunk_length,
+                                conversion_config.chunk_width,
+                                conversion_config.compressor,
+                                conversion_config.blosc_compression_algorithm,
+                                conversion_config.blosc_compression_level,
+                                conversion_config.blosc_shuffle_mode,
+                                conversion_config.blosc_blocksize))
+    return '{}:{}:{}'.format(vcf_stat.st_mtime_ns, vcf_stat.st_size, conversion_settings)
+
+
+def zarr_output_up_to_date(input_vcf_path, output_zarr_path, conversion_config):
+    """
+    Checks whether a previous VCF to Zarr conversion output is still current, i.e. the
+    source VCF file and conversion settings match the stamp written alongside the output.
+    :param input_vcf_path: The input VCF file location
+    :param output_zarr_path: The Zarr output location to check
+    :param conversion_config: Configuration data for the conversion
+    :type input_vcf_path: str
+    :type output_zarr_path: str
+    :type conversion_config: config.VCFtoZarrConfigurationRepresentation
+    :return: bool
+    """
+    if not os.path.isdir(output_zarr_path):
+        return False
+    stamp_contents = read_file_contents('{}.stamp'.format(output_zarr_path))
+    return stamp_contents == vcf_to_zarr_stamp_data(input_vcf_path, conversion_config)
 
-        # Convert to Zarr format
-        convert_to_zarr(input_vcf_path=path_str,
-                        output_zarr_path=path_zarr_output,
-                        conversion_config=conversion_config)
+
+def vcf_alt_number_cache_path(input_vcf_path):
+    """
+    Returns the location of the sidecar file used to cache the computed alt number
+    for the VCF file specified.
+    :param input_vcf_path: The input VCF file location
+    :type input_vcf_path: str
+    :return: str
+    """
+    return '{}.altnumber'.format(input_vcf_path)
+
+
+def read_cached_alt_number(input_vcf_path):
+    """
+    Reads the alt number cached for the VCF file specified, or None if no cache entry
+    exists or the VCF file has changed since the entry was written.
+    :param input_vcf_path: The input VCF file location
+    :type input_vcf_path: str
+    :return: int or None
+    """
+    contents = read_file_contents(vcf_alt_number_cache_path(input_vcf_path))
+    if contents is None:
+        return None
+    fields = contents.split(':')
+    if len(fields) != 3:
+        return None
+    vcf_stat = os.stat(input_vcf_path)
+    if fields[0] != str(vcf_stat.st_mtime_ns) or fields[1] != str(vcf_stat.st_size):
+        return None
+    return int(fields[2])
+
+
+def write_cached_alt_number(input_vcf_path, alt_number):
+    """
+    Caches the alt number computed for the VCF file specified, keyed on the file's
+    modification time and size so a changed VCF invalidates the entry.
+    :param input_vcf_path: The input VCF file location
+    :param alt_number: The computed alt number to cache
+    :type input_vcf_path: str
+    :type alt_number: int
+    """
+    vcf_stat = os.stat(input_vcf_path)
+    with open(vcf_alt_number_cache_path(input_vcf_path), 'w') as cache_file:
+        cache_file.write('{}:{}:{}'.format(vcf_stat.st_mtime_ns, vcf_stat.st_size, int(alt_number)))
 
 
 def convert_to_zarr(input_vcf_path, output_zarr_path, conversion_config, benchmark_profiler=None):
@@ -304,56 +543,106 @@ def convert_to_zarr(input_vcf_path, output_zarr_path, conversion_config, benchma
     :type benchmark_runner: core.BenchmarkProfiler
     """
     if conversion_config is not None:
-        # Ensure var is string, not pathlib.Path
-        output_zarr_path = str(output_zarr_path)
+        # Skip the conversion entirely if the existing Zarr output is already up to
+        # date with the input VCF file and the conversion settings
+        if zarr_output_up_to_date(input_vcf_path, output_zarr_path, conversion_config):
+            print("[VCF-Zarr] Zarr output is up to date with the input VCF file. Skipping conversion: {}"
+                  .format(output_zarr_path))
+            return
 
         # Get fields to extract (for unit testing only)
         fields = conversion_config.fields
 
         # Get alt number
         if conversion_config.alt_number is None:
-            print("[VCF-Zarr] Determining maximum number of ALT alleles by scaling all variants in the VCF file.")
+            # Check for an alt number cached by a previous scan of this VCF file
+            alt_number = read_cached_alt_number(input_vcf_path)
+            if alt_number is not None:
+                print("[VCF-Zarr] Using alt number cached from a previous scan of the VCF file.")
+            else:
+                print("[VCF-Zarr] Determining maximum number of ALT alleles by scaling all variants in the VCF file.")
 
-            if benchmark_profiler is not None:
-                benchmark_profiler.start_benchmark(operation_name="Read VCF file into memory for alt number")
+                if benchmark_profiler is not None:
+                    benchmark_profiler.start_benchmark(operation_name="Read VCF file into memory for alt number")
 
-            # Scan VCF file to find max number of alleles in any variant
-            callset = allel.read_vcf(input_vcf_path, fields=['numalt'], log=sys.stdout)
+                # Scan VCF file to find max number of alleles in any variant
+                with open_vcf_file(input_vcf_path) as vcf_file:
+                    callset = allel.read_vcf(vcf_file, fields=['numalt'], log=sys.stdout)
 
-            if benchmark_profiler is not None:
-                benchmark_profiler.end_benchmark()
+                if benchmark_profiler is not None:
+                    benchmark_profiler.end_benchmark()
 
-            numalt = callset['variants/numalt']
+                numalt = callset['variants/numalt']
 
-            if benchmark_profiler is not None:
-                benchmark_profiler.start_benchmark(operation_name="Determine maximum alt number")
+                if benchmark_profiler is not None:
+                    benchmark_profiler.start_benchmark(operation_name="Determine maximum alt number")
 
-            alt_number = np.max(numalt)
+                alt_number = np.max(numalt)
 
-            if benchmark_profiler is not None:
-                benchmark_profiler.end_benchmark()
+                if benchmark_profiler is not None:
+                    benchmark_profiler.end_benchmark()
+
+                # Cache the scan result so later conversions of the same VCF skip the scan
+                write_cached_alt_number(input_vcf_path, alt_number)
         else:
             print("[VCF-Zarr] Using alt number provided in configuration.")
             # Use the configuration-provided alt number
             alt_number = conversion_config.alt_number
         print("[VCF-Zarr] Alt number: {}".format(alt_number))
 
+        # Read the sample count from the VCF header once if either chunk dimension is automatic
+        num_samples = None
+        if "auto" in (conversion_config.chunk_length, conversion_config.chunk_width):
+            with open_vcf_file(input_vcf_path) as vcf_file:
+                num_samples = len(allel.io.vcf_read.read_vcf_headers(vcf_file).samples)
+
         # Get chunk length
         chunk_length = allel.io.vcf_read.DEFAULT_CHUNK_LENGTH
-        if conversion_config.chunk_length is not None:
+        if conversion_config.chunk_length == "auto":
+            # Scale the chunk length down with the sample count so the in-memory chunk
+            # buffers stay roughly constant-sized on high-sample-count VCF files
+            chunk_length = max(1, 100000 // max(1, num_samples // 3000))
+        elif conversion_config.chunk_length is not None:
             chunk_length = conversion_config.chunk_length
         print("[VCF-Zarr] Chunk length: {}".format(chunk_length))
 
         # Get chunk width
         chunk_width = allel.io.vcf_read.DEFAULT_CHUNK_WIDTH
-        if conversion_config.chunk_width is not None:
+        if conversion_config.chunk_width == "auto":
+            # Cover every sample in one chunk up to a bounded width, so narrow call sets
+            # are not split into needlessly thin chunks on the sample axis
+            chunk_width = max(1, min(num_samples, 3000))
+        elif conversion_config.chunk_width is not None:
             chunk_width = conversion_config.chunk_width
         print("[VCF-Zarr] Chunk width: {}".format(chunk_width))
 
+        # Get VCF read buffer size
+        buffer_size = allel.io.vcf_read.DEFAULT_BUFFER_SIZE
+        if conversion_config.buffer_size is not None:
+            buffer_size = conversion_config.buffer_size
+
         if conversion_config.compressor == "Blosc":
+            # Ensure the configured algorithm was compiled into this numcodecs build,
+            # rather than letting Blosc fail mid-conversion
+            available_compressors = numcodecs.blosc.list_compressors()
+            if conversion_config.blosc_compression_algorithm not in available_compressors:
+                raise ValueError("Blosc compression algorithm '{}' is not available in this numcodecs build.\n"
+                                 "Available algorithms: {}".format(conversion_config.blosc_compression_algorithm,
+                                                                   ", ".join(available_compressors)))
+
+            # Enable multithreaded Blosc compression; the conversion is compute-bound
+            # in the compressor, so this scales with the machine's core count
+            blosc_nthreads = conversion_config.blosc_nthreads
+            if blosc_nthreads is None:
+                blosc_nthreads = min(8, os.cpu_count() or 1)
+            numcodecs.blosc.set_nthreads(blosc_nthreads)
+
+            # The codec's typesize (and hence shuffle lane width) is taken from each
+            # array's dtype at encode time, so int8 genotype data shuffles on 1-byte lanes
             compressor = Blosc(cname=conversion_config.blosc_compression_algorithm,
                                clevel=conversion_config.blosc_compression_level,
-                               shuffle=conversion_config.blosc_shuffle_mode)
+                               shuffle=conversion_config.blosc_shuffle_mode,
+                               blocksize=conversion_config.blosc_blocksize)
         else:
             raise ValueError("Unexpected compressor type specified.")
 
@@ -361,12 +650,23 @@ def convert_to_zarr(input_vcf_path, output_zarr_path, conversion_config, benchma
             benchmark_profiler.start_benchmark(operation_name="Convert VCF to Zarr")
 
         # Perform the VCF to Zarr conversion
-        allel.vcf_to_zarr(input_vcf_path, output_zarr_path, alt_number=alt_number, overwrite=True, fields=fields,
-                          log=sys.stdout, compressor=compressor, chunk_length=chunk_length, chunk_width=chunk_width)
+        with open_vcf_file(input_vcf_path) as vcf_file:
+            allel.vcf_to_zarr(vcf_file, output_zarr_path, alt_number=alt_number, overwrite=True, fields=fields,
+                              log=sys.stdout, compressor=compressor, chunk_length=chunk_length,
+                              chunk_width=chunk_width, buffer_size=buffer_size)
 
         if benchmark_profiler is not None:
             benchmark_profiler.end_benchmark()
 
+        # Consolidate the per-array metadata into a single .zmetadata key so readers
+        # can open the whole hierarchy with one read instead of one per array
+        zarr.consolidate_metadata(output_zarr_path)
+
+        # Write a stamp alongside the output so later runs can detect that the
+        # conversion is already up to date and skip the work
+        with open('{}.stamp'.format(output_zarr_path), 'w') as stamp_file:
+            stamp_file.write(vcf_to_zarr_stamp_data(input_vcf_path, conversion_config))
+
 
 def get_callset_genotype_data(callset):
     genotype_ref_name = ''
@@ -387,29 +687,59 @@ def get_callset_genotype_data(callset):
     return gtz
 
 
+def open_multi_zarr(callsets):
+    """
+    Combines the genotype data of multiple callsets into one virtual dask array,
+    concatenated along the variants axis. Each underlying Zarr array is wrapped
+    with its native chunking, so building the combined view is pure metadata work:
+    no rechunk pass, and no genotype data is read until the array is computed.
+    :param callsets: The callsets whose genotype data should be combined
+    :type callsets: list
+    :return: dask.array.Array
+    """
+    gt_list = [get_callset_genotype_data(callset) for callset in callsets]
+    return da.concatenate([da.from_array(gt, chunks=gt.chunks) for gt in gt_list], axis=0)
+
+
 def get_genotype_array_concat(callsets, genotype_array_type=config.GENOTYPE_ARRAY_DASK):
     if len(callsets) == 1:
         # Only one callset provided. No need for concatenation
         callset = callsets[0]
         return get_genotype_array(callset=callset, genotype_array_type=genotype_array_type)
 
-    gt_list = []
+    if genotype_array_type == config.GENOTYPE_ARRAY_DASK:
+        # Open the stores as one lazy virtual dataset; the concat/copy step the
+        # eager array types below perform is skipped entirely
+        return allel.GenotypeDaskArray(open_multi_zarr(callsets))
 
     # Get genotype data for each callset
-    for callset in callsets:
-        gt = get_callset_genotype_data(callset)
-        if genotype_array_type == config.GENOTYPE_ARRAY_DASK:
-            # Encapsulate underlying zarr array with a chunked dask array
-            gt = da.from_array(gt, chunks=gt.chunks)
-        gt_list.append(gt)
-
-    if genotype_array_type == config.GENOTYPE_ARRAY_DASK:
-        combined_gt = da.concatenate(gt_list, axis=0)
-        combined_gt = allel.GenotypeDaskArray(combined_gt)
-    elif genotype_array_type == config.GENOTYPE_ARRAY_CHUNKED:
-        combined_gt = allel.GenotypeChunkedArray(np.concatenate(gt_list, axis=0))
+    gt_list = [get_callset_genotype_data(callset) for callset in callsets]
+
+    if genotype_array_type == config.GENOTYPE_ARRAY_CHUNKED:
+        # Append each callset into a single Zarr array one piece at a time, so peak
+        # memory stays at one callset instead of an ndarray the size of their sum
+        combined_zarr = None
+        for gt in gt_list:
+            if combined_zarr is None:
+                chunks = gt.chunks if isinstance(gt, zarr.Array) else None
+                combined_zarr = zarr.array(gt, chunks=chunks)
+            else:
+                combined_zarr.append(gt, axis=0)
+        combined_gt = allel.GenotypeChunkedArray(combined_zarr)
     elif genotype_array_type == config.GENOTYPE_ARRAY_NORMAL:
-        combined_gt = allel.GenotypeArray(np.concatenate(gt_list, axis=0))
+        # Preallocate the combined array and decode each callset into its row slice,
+        # avoiding np.concatenate's allocate-then-copy of every input at once
+        num_variants = sum(gt.shape[0] for gt in gt_list)
+        combined_buffer = np.empty((num_variants,) + gt_list[0].shape[1:], dtype=gt_list[0].dtype)
+        row_offset = 0
+        for gt in gt_list:
+            row_slice = combined_buffer[row_offset:row_offset + gt.shape[0]]
+            if isinstance(gt, zarr.Array):
+                gt.get_basic_selection(out=row_slice)
+            else:
+                row_slice[:] = gt[:]
+            row_offset += gt.shape[0]
+        combined_gt = allel.GenotypeArray(combined_buffer)
     else:
         raise ValueError('Error: Invalid option specified for genotype_array_type.')
 
@@ -420,6 +750,12 @@ def get_genotype_array(callset, genotype_array_type=config.GENOTYPE_ARRAY_DASK):
     gtz = get_callset_genotype_data(callset)
 
     if genotype_array_type == config.GENOTYPE_ARRAY_NORMAL:
+        if isinstance(gtz, zarr.Array):
+            # Decode the Zarr data directly into a preallocated buffer so peak memory
+            # stays at one copy of the genotype data rather than two
+            gt_buffer = np.empty(gtz.shape, dtype=gtz.dtype)
+            gtz.get_basic_selection(out=gt_buffer)
+            return allel.GenotypeArray(gt_buffer)
         return allel.GenotypeArray(gtz)
     elif genotype_array_type == config.GENOTYPE_ARRAY_DASK:
         return allel.GenotypeDaskArray(gtz)
@@ -49,9 +49,10 @@ CLASSIFIERS = [
     'Operating System :: OS Independent',
     'Environment :: Console',
     'Programming Language :: Python',
-    'Programming Language :: Python :: 2.7',
-    'Programming Language :: Python :: 3.5',
-    'Programming Language :: Python :: 3.6',
+    'Programming Language :: Python :: 3.9',
+    'Programming Language :: Python :: 3.10',
+    'Programming Language :: Python :: 3.11',
+    'Programming Language :: Python :: 3.12',
 ]
 
 with open('README.rst', 'r') as f:
@@ -78,16 +79,18 @@ setup(
         'scipy',
         'dask',
         'distributed',
+        'fsspec',
+        'numba',
         'numcodecs',
+        'pyarrow',
         'zarr',
         'scikit-learn',
         'scikit-allel',
         'pyperf',
         'toolz',
-        'influxdb',
-        'mock;python_version=="2.7"',
-        'pathlib;python_version=="2.7"'
+        'influxdb'
     ],
+    python_requires='>=3.9',
     entry_points={
         'console_scripts': [
             'genben = genben:main'
@@ -7,6 +7,7 @@ from genben.config import \
     DataDirectoriesConfigurationRepresentation
 from time import sleep
 import os
+import pyarrow.feather
 import shutil
 
 
@@ -134,6 +135,83 @@ class TestCoreBenchmark(unittest.TestCase):
         if os.path.exists(csv_file):
             os.remove(csv_file)
 
+    def test_benchmark_results_feather(self):
+        # Set up output results config for test
+        output_config = OutputConfigurationRepresentation()
+        output_config.output_csv_enabled = False
+        output_config.output_feather_enabled = True
+        output_config.output_influxdb_enabled = False
+
+        # Setup Benchmark Profiler object
+        profiler_label = 'test_benchmark_results_feather'
+
+        # Delete *.feather file created from any previous unit testing
+        feather_file = '{}.feather'.format(profiler_label)
+        if os.path.exists(feather_file):
+            os.remove(feather_file)
+
+        profiler = BenchmarkProfiler(output_config, profiler_label)
+
+        operation_name_format = 'Sleep {} seconds'
+
+        # Run a few mock benchmarks
+        benchmark_times = [1, 2, 3]
+        i = 1
+        for benchmark_time in benchmark_times:
+            profiler.set_run_number(i)
+
+            operation_name = operation_name_format.format(benchmark_time)
+
+            # Run the mock benchmark, measuring time to run sleep command
+            profiler.start_benchmark(operation_name)
+            sleep(benchmark_time)
+            profiler.end_benchmark()
+
+            i += 1
+
+        # Feather results are buffered in memory and written out when the profiler is closed
+        profiler.close()
+
+        # Ensure feather file was created
+        if os.path.exists(feather_file):
+            # Read file contents
+            table = pyarrow.feather.read_table(feather_file)
+
+            # Ensure column names of feather file are correct
+            column_names_expected = ['log_timestamp', 'run_number', 'operation', 'execution_time']
+            self.assertEqual(column_names_expected, table.column_names)
+
+            # Check row count of feather file. Row count should be equal to number of benchmarks run
+            num_rows_expected = len(benchmark_times)
+            self.assertEqual(num_rows_expected, table.num_rows, msg='Row count in resulting feather file is incorrect.')
+
+            # Ensure contents (benchmark data) of feather file are correct
+            run_numbers = table.column('run_number').to_pylist()
+            operations = table.column('operation').to_pylist()
+            execution_times = table.column('execution_time').to_pylist()
+            i = 1
+            for row_number in range(num_rows_expected):
+                # Ensure run number is correct
+                self.assertEqual(i, run_numbers[row_number], msg='Run number is incorrect.')
+
+                # Ensure operation name is correct
+                operation_name_expected = operation_name_format.format(benchmark_times[i - 1])
+                self.assertEqual(operation_name_expected, operations[row_number], msg='Operation name is incorrect.')
+
+                # Ensure execution time is correct
+                execution_time_actual = int(execution_times[row_number])  # Convert to int to truncate decimals
+                execution_time_expected = benchmark_times[i - 1]
+                self.assertEqual(execution_time_expected, execution_time_actual, msg='Execution time is incorrect')
+
+                i += 1
+
+        else:
+            self.fail(msg='Resulting feather file could not be found.')
+
+        # Delete *.feather file created when running benchmark
+        if os.path.exists(feather_file):
+            os.remove(feather_file)
+
     def test_benchmark_simple_aggregations(self):
         test_dir = './tests_temp/'
         benchmark_label = 'test_benchmark_simple_aggregations'
@@ -147,6 +225,11 @@ class TestCoreBenchmark(unittest.TestCase):
         if os.path.isfile(csv_file):
             os.remove(csv_file)
 
+        # Remove the alt number cache from any previous unit tests so the scan is benchmarked
+        altnumber_file = './tests/data/trio.2010_06.ychr.genotypes.vcf.altnumber'
+        if os.path.isfile(altnumber_file):
+            os.remove(altnumber_file)
+
         vcf_to_zar_config = VCFtoZarrConfigurationRepresentation()
         vcf_to_zar_config.enabled = True
 
@@ -162,6 +245,7 @@ class TestCoreBenchmark(unittest.TestCase):
         bench_conf.benchmark_data_input = 'vcf'
         bench_conf.benchmark_dataset = 'trio.2010_06.ychr.genotypes.vcf'
         bench_conf.benchmark_aggregations = True
+        bench_conf.benchmark_aggregations_fused = False  # Run each aggregation as a separate operation
 
         data_dirs = DataDirectoriesConfigurationRepresentation()
         data_dirs.vcf_dir = './tests/data/'
@@ -221,6 +305,250 @@ class TestCoreBenchmark(unittest.TestCase):
         if os.path.isfile(csv_file):
             os.remove(csv_file)
 
+    def test_benchmark_simple_aggregations_fused(self):
+        test_dir = './tests_temp/'
+        benchmark_label = 'test_benchmark_simple_aggregations_fused'
+        csv_file = '{}.csv'.format(benchmark_label)
+
+        # Remove the test data directory from any previous unit tests
+        if os.path.isdir(test_dir):
+            shutil.rmtree(test_dir)
+
+        # Remove the csv file from any previous unit tests
+        if os.path.isfile(csv_file):
+            os.remove(csv_file)
+
+        # Remove the alt number cache from any previous unit tests so the scan is benchmarked
+        altnumber_file = './tests/data/trio.2010_06.ychr.genotypes.vcf.altnumber'
+        if os.path.isfile(altnumber_file):
+            os.remove(altnumber_file)
+
+        vcf_to_zar_config = VCFtoZarrConfigurationRepresentation()
+        vcf_to_zar_config.enabled = True
+
+        output_config = OutputConfigurationRepresentation()
+        output_config.output_csv_enabled = True
+        output_config.output_csv_delimiter = ','
+        output_config.output_influxdb_enabled = False
+
+        bench_conf = BenchmarkConfigurationRepresentation()
+        bench_conf.vcf_to_zarr_config = vcf_to_zar_config
+        bench_conf.results_output_config = output_config
+        bench_conf.benchmark_number_runs = 1
+        bench_conf.benchmark_data_input = 'vcf'
+        bench_conf.benchmark_dataset = 'trio.2010_06.ychr.genotypes.vcf'
+        bench_conf.benchmark_aggregations = True
+        bench_conf.benchmark_aggregations_fused = True
+
+        data_dirs = DataDirectoriesConfigurationRepresentation()
+        data_dirs.vcf_dir = './tests/data/'
+        data_dirs.zarr_dir_setup = './tests_temp/zarr/'
+        data_dirs.zarr_dir_benchmark = './tests_temp/zarr_benchmark/'
+        data_dirs.temp_dir = './tests_temp/temp/'
+
+        # Run the benchmark and ensure nothing fails
+        benchmark = Benchmark(bench_conf=bench_conf,
+                              data_dirs=data_dirs,
+                              benchmark_label=benchmark_label)
+        benchmark.run_benchmark()
+
+        # Ensure csv file was created
+        if os.path.exists(csv_file):
+            # Read file contents
+            with open(csv_file, 'r') as f:
+                csv_lines = [line.rstrip('\n') for line in f]
+
+            # Check line count of csv file
+            num_lines = len(csv_lines)
+            num_lines_expected = 7
+            self.assertEqual(num_lines_expected, num_lines, msg='Unexpected line count in resulting csv file.')
+
+            csv_operation_names = [csv_line.split(',')[2] for csv_line in csv_lines]
+
+            # Ensure the fused aggregations operation was run (Dask genotype array type is the default)
+            if 'Simple Aggregations (fused Dask)' not in csv_operation_names:
+                self.fail(msg='Operation \"Simple Aggregations (fused Dask)\" was not run during the benchmark.')
+        else:
+            self.fail(msg='Resulting csv file could not be found.')
+
+        # Remove the test data directory from any previous unit tests
+        if os.path.isdir(test_dir):
+            shutil.rmtree(test_dir)
+
+        # Remove the csv file from this unit test
+        if os.path.isfile(csv_file):
+            os.remove(csv_file)
+
+    def test_benchmark_simple_aggregations_fused_normal(self):
+        test_dir = './tests_temp/'
+        benchmark_label = 'test_benchmark_simple_aggregations_fused_normal'
+        csv_file = '{}.csv'.format(benchmark_label)
+
+        # Remove the test data directory from any previous unit tests
+        if os.path.isdir(test_dir):
+            shutil.rmtree(test_dir)
+
+        # Remove the csv file from any previous unit tests
+        if os.path.isfile(csv_file):
+            os.remove(csv_file)
+
+        # Remove the alt number cache from any previous unit tests so the scan is benchmarked
+        altnumber_file = './tests/data/trio.2010_06.ychr.genotypes.vcf.altnumber'
+        if os.path.isfile(altnumber_file):
+            os.remove(altnumber_file)
+
+        vcf_to_zar_config = VCFtoZarrConfigurationRepresentation()
+        vcf_to_zar_config.enabled = True
+
+        output_config = OutputConfigurationRepresentation()
+        output_config.output_csv_enabled = True
+        output_config.output_csv_delimiter = ','
+        output_config.output_influxdb_enabled = False
+
+        bench_conf = BenchmarkConfigurationRepresentation()
+        bench_conf.vcf_to_zarr_config = vcf_to_zar_config
+        bench_conf.results_output_config = output_config
+        bench_conf.benchmark_number_runs = 1
+        bench_conf.benchmark_data_input = 'vcf'
+        bench_conf.benchmark_dataset = 'trio.2010_06.ychr.genotypes.vcf'
+        bench_conf.benchmark_aggregations = True
+        bench_conf.benchmark_aggregations_fused = True
+        # Use the in-memory genotype array so the fused Numba kernel path is exercised
+        bench_conf.genotype_array_type = config.GENOTYPE_ARRAY_NORMAL
+
+        data_dirs = DataDirectoriesConfigurationRepresentation()
+        data_dirs.vcf_dir = './tests/data/'
+        data_dirs.zarr_dir_setup = './tests_temp/zarr/'
+        data_dirs.zarr_dir_benchmark = './tests_temp/zarr_benchmark/'
+        data_dirs.temp_dir = './tests_temp/temp/'
+
+        # Run the benchmark and ensure nothing fails
+        benchmark = Benchmark(bench_conf=bench_conf,
+                              data_dirs=data_dirs,
+                              benchmark_label=benchmark_label)
+        benchmark.run_benchmark()
+
+        # Ensure csv file was created
+        if os.path.exists(csv_file):
+            # Read file contents
+            with open(csv_file, 'r') as f:
+                csv_lines = [line.rstrip('\n') for line in f]
+
+            # Check line count of csv file
+            num_lines = len(csv_lines)
+            num_lines_expected = 7
+            self.assertEqual(num_lines_expected, num_lines, msg='Unexpected line count in resulting csv file.')
+
+            csv_operation_names = [csv_line.split(',')[2] for csv_line in csv_lines]
+
+            # Ensure the fused kernel aggregations operation was run
+            if 'Simple Aggregations Fused' not in csv_operation_names:
+                self.fail(msg='Operation \"Simple Aggregations Fused\" was not run during the benchmark.')
+        else:
+            self.fail(msg='Resulting csv file could not be found.')
+
+        # Remove the test data directory from any previous unit tests
+        if os.path.isdir(test_dir):
+            shutil.rmtree(test_dir)
+
+        # Remove the csv file from this unit test
+        if os.path.isfile(csv_file):
+            os.remove(csv_file)
+
+    def test_benchmark_zarr_concatenation(self):
+        test_dir = './tests_temp/'
+        benchmark_label = 'test_benchmark_zarr_concatenation'
+        csv_file = '{}.csv'.format(benchmark_label)
+
+        # Remove the test data directory from any previous unit tests
+        if os.path.isdir(test_dir):
+            shutil.rmtree(test_dir)
+
+        # Remove the csv file from any previous unit tests
+        if os.path.isfile(csv_file):
+            os.remove(csv_file)
+
+        # Remove the alt number cache from any previous unit tests
+        altnumber_file = './tests/data/trio.2010_06.ychr.genotypes.vcf.altnumber'
+        if os.path.isfile(altnumber_file):
+            os.remove(altnumber_file)
+
+        vcf_to_zar_config = VCFtoZarrConfigurationRepresentation()
+        vcf_to_zar_config.enabled = True
+
+        # Convert the test VCF into two Zarr datasets ahead of the benchmark, as Setup
+        # mode would. The conversion writes *.stamp sidecar files next to the stores,
+        # which concatenation mode must not try to open as datasets
+        input_vcf_path = './tests/data/trio.2010_06.ychr.genotypes.vcf'
+        zarr_dir_setup = './tests_temp/zarr/'
+        data_service.create_directory_tree(zarr_dir_setup)
+        for zarr_dataset in ['trio_a', 'trio_b']:
+            data_service.convert_to_zarr(input_vcf_path=input_vcf_path,
+                                         output_zarr_path=os.path.join(zarr_dir_setup, zarr_dataset),
+                                         conversion_config=vcf_to_zar_config)
+
+        output_config = OutputConfigurationRepresentation()
+        output_config.output_csv_enabled = True
+        output_config.output_csv_delimiter = ','
+        output_config.output_influxdb_enabled = False
+
+        bench_conf = BenchmarkConfigurationRepresentation()
+        bench_conf.vcf_to_zarr_config = vcf_to_zar_config
+        bench_conf.results_output_config = output_config
+        bench_conf.benchmark_number_runs = 1
+        bench_conf.benchmark_data_input = 'zarr'
+        bench_conf.benchmark_dataset = '*'  # Concatenate all datasets in the setup directory
+        bench_conf.benchmark_aggregations = True
+        bench_conf.benchmark_aggregations_fused = True
+
+        data_dirs = DataDirectoriesConfigurationRepresentation()
+        data_dirs.vcf_dir = './tests/data/'
+        data_dirs.zarr_dir_setup = zarr_dir_setup
+        data_dirs.zarr_dir_benchmark = './tests_temp/zarr_benchmark/'
+        data_dirs.temp_dir = './tests_temp/temp/'
+
+        # Run the benchmark and ensure nothing fails
+        benchmark = Benchmark(bench_conf=bench_conf,
+                              data_dirs=data_dirs,
+                              benchmark_label=benchmark_label)
+        benchmark.run_benchmark()
+
+        # Ensure csv file was created
+        if os.path.exists(csv_file):
+            # Read file contents
+            with open(csv_file, 'r') as f:
+                csv_lines = [line.rstrip('\n') for line in f]
+
+            # Check line count of csv file
+            num_lines = len(csv_lines)
+            num_lines_expected = 4
+            self.assertEqual(num_lines_expected, num_lines, msg='Unexpected line count in resulting csv file.')
+
+            csv_operation_names = [csv_line.split(',')[2] for csv_line in csv_lines]
+
+            # Ensure the concatenated datasets were loaded and benchmarked
+            test_operation_names = ['Load Zarr Dataset',
+                                    'Create Genotype Array',
+                                    'Simple Aggregations (fused Dask)']
+
+            for test_operation_name in test_operation_names:
+                if test_operation_name not in csv_operation_names:
+                    self.fail(msg='Operation \"{}\" was not run during the benchmark.'.format(test_operation_name))
+        else:
+            self.fail(msg='Resulting csv file could not be found.')
+
+        # Remove the test data directory from any previous unit tests
+        if os.path.isdir(test_dir):
+            shutil.rmtree(test_dir)
+
+        # Remove the csv file from this unit test
+        if os.path.isfile(csv_file):
+            os.remove(csv_file)
+
+        # Remove the alt number cache written by the conversions above
+        if os.path.isfile(altnumber_file):
+            os.remove(altnumber_file)
+
     def test_benchmark_pca(self):
         test_dir = './tests_temp/'
         benchmark_label = 'test_benchmark_pca'
@@ -234,6 +562,11 @@ class TestCoreBenchmark(unittest.TestCase):
         if os.path.isfile(csv_file):
             os.remove(csv_file)
 
+        # Remove the alt number cache from any previous unit tests so the scan is benchmarked
+        altnumber_file = './tests/data/trio.2010_06.ychr.genotypes.vcf.altnumber'
+        if os.path.isfile(altnumber_file):
+            os.remove(altnumber_file)
+
         vcf_to_zar_config = VCFtoZarrConfigurationRepresentation()
         vcf_to_zar_config.enabled = True
 
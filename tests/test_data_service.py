@@ -5,12 +5,21 @@
 import unittest
 import os.path
 import shutil
+import threading
 import zarr
 import numpy as np
-from ftplib import error_temp
+from ftplib import FTP, error_temp
 
 from genben import data_service, config
 
+try:
+    from pyftpdlib.authorizers import DummyAuthorizer
+    from pyftpdlib.handlers import FTPHandler
+    from pyftpdlib.servers import FTPServer
+    pyftpdlib_available = True
+except ImportError:
+    pyftpdlib_available = False
+
 
 class TestDataServices(unittest.TestCase):
     def test_fetch_data_via_ftp(self):
@@ -41,21 +50,53 @@ class TestDataServices(unittest.TestCase):
             if os.path.isfile(file):
                 os.remove(file)
 
-    def test_decompress_gzip(self):
-        """ Tests decompressing the fetched file. """
-        local_file_gz = "./tests/data/trio.2010_06.ychr.genotypes.vcf.gz"
-        local_filename = "trio.2010_06.ychr.genotypes.vcf"
-
-        # Attempt to remove local file in case a previous unit test failed to do so (prevents false positive)
-        if os.path.isfile(local_filename):
-            os.remove(local_filename)
-
-        data_service.decompress_gzip(local_file_gz, local_filename)
-        self.assertTrue(os.path.isfile(local_filename), "No local file decompressed.")
-
-        # Remove the downloaded file
-        if os.path.isfile(local_filename):
-            os.remove(local_filename)
+    @unittest.skipUnless(pyftpdlib_available, "pyftpdlib is required to run a local FTP server")
+    def test_fetch_data_via_ftp_recursive_binary(self):
+        # Binary payload with bare LF bytes; an ASCII-mode (TYPE A) transfer would
+        # corrupt it with CRLF translation after the MLSD listing round-trips
+        test_payload = bytes(range(256)) * 3 + b"\n" * 16
+
+        remote_root = "./data/unittest_ftp/remote/"
+        local_root = "./data/unittest_ftp/local/"
+        for directory in [remote_root, local_root]:
+            if os.path.exists(directory):
+                shutil.rmtree(directory)
+        data_service.create_directory_tree(remote_root + "files/subdir/")
+        data_service.create_directory_tree(local_root)
+        with open(remote_root + "files/test.bin", "wb") as f:
+            f.write(test_payload)
+        with open(remote_root + "files/subdir/nested.bin", "wb") as f:
+            f.write(test_payload)
+
+        # Serve the remote directory from a local FTP server on an ephemeral port
+        authorizer = DummyAuthorizer()
+        authorizer.add_anonymous(os.path.abspath(remote_root), perm="elr")
+        handler = FTPHandler
+        handler.authorizer = authorizer
+        server = FTPServer(("127.0.0.1", 0), handler)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        try:
+            ftp = FTP()
+            ftp.connect("127.0.0.1", server.address[1])
+            ftp.login()
+            data_service.fetch_data_via_ftp_recursive(ftp=ftp,
+                                                      local_directory=local_root,
+                                                      remote_directory="files")
+            ftp.close()
+
+            for local_file in [local_root + "test.bin", local_root + "subdir/nested.bin"]:
+                with open(local_file, "rb") as f:
+                    self.assertEqual(f.read(), test_payload)
+        finally:
+            server.close_all()
+            server_thread.join()
+            shutil.rmtree("./data/unittest_ftp/")
+
+    def test_strip_vcf_extension(self):
+        self.assertEqual(data_service.strip_vcf_extension("sample.vcf"), "sample")
+        self.assertEqual(data_service.strip_vcf_extension("sample.vcf.gz"), "sample")
+        self.assertEqual(data_service.strip_vcf_extension("sample"), "sample")
 
     def test_read_file_contents_existing_file(self):
         local_filepath = "./tests/data/test_read_file_contents_data.txt"
@@ -79,7 +120,7 @@ class TestDataServices(unittest.TestCase):
         # Define test input files
         test_dir = "./tests/data/"
         test_files_input = ["trio.2010_06.ychr.genotypes.vcf.gz"]
-        test_files_expected = ["trio.2010_06.ychr.genotypes.vcf"]
+        test_files_expected = ["trio.2010_06.ychr.genotypes.vcf.gz"]  # Compressed files are passed through as-is
 
         # Setup test processing directories
         process_data_files_test_dir = "./data/unittest/"
@@ -121,9 +162,12 @@ class TestDataServices(unittest.TestCase):
         input_vcf_path = "./tests/data/trio.2010_06.ychr.genotypes.vcf"
         output_zarr_path = "trio.2010_06.ychr.genotypes.zarr"
 
-        # Attempt to remove local file in case a previous unit test failed to do so (prevents false positive)
+        # Attempt to remove local files in case a previous unit test failed to do so (prevents false positive)
         if os.path.isdir(output_zarr_path):
             shutil.rmtree(output_zarr_path)
+        for sidecar_file in [output_zarr_path + ".stamp", input_vcf_path + ".altnumber"]:
+            if os.path.isfile(sidecar_file):
+                os.remove(sidecar_file)
 
         if os.path.isfile(input_vcf_path):
             # Setup test settings for Zarr conversion
@@ -145,12 +189,18 @@ class TestDataServices(unittest.TestCase):
             numalt = callset['variants/numalt']
             self.assertEqual(np.size(numalt), 959)
             self.assertEqual(np.max(numalt), 1)
+
+            # Ensure the conversion consolidated the store metadata for fast reopening
+            self.assertTrue(os.path.isfile(os.path.join(output_zarr_path, ".zmetadata")))
         else:
             self.fail("Test data file does not exist. Please ensure the file exists and try running test again")
 
         # Remove the Zarr test data
         if os.path.isdir(output_zarr_path):
             shutil.rmtree(output_zarr_path)
+        for sidecar_file in [output_zarr_path + ".stamp", input_vcf_path + ".altnumber"]:
+            if os.path.isfile(sidecar_file):
+                os.remove(sidecar_file)
 
 
 if __name__ == "__main__":